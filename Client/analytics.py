@@ -0,0 +1,153 @@
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .utils import extract_rows
+
+# Column name -> broker field names to try, in order
+POSITION_FIELDS = {
+    "net_qty": ("netQuantity", "netQty", "quantity"),
+    "avg_price": ("netAvgPrice", "netAveragePrice", "averagePrice", "avgPrice"),
+    "ltp": ("ltp", "lastTradedPrice"),
+    "realized": ("realizedPnl", "realisedPnl", "realizedPNL"),
+    "unrealized": ("unrealizedPnl", "unrealisedPnl", "unrealizedPNL"),
+}
+
+HOLDING_FIELDS = {
+    "qty": ("holdingQuantity", "quantity", "qty", "totalQuantity"),
+    "avg_price": ("averagePrice", "avgPrice", "price"),
+    "ltp": ("ltp", "lastTradedPrice", "closePrice"),
+}
+
+LABEL_FIELDS = {
+    "symbol": ("tradingSymbol", "symbol", "formattedInstrumentName"),
+    "exchange": ("exchange", "exch"),
+    "product": ("product", "prod"),
+}
+
+
+def _field(row: dict, names: Sequence[str]):
+    for name in names:
+        value = row.get(name)
+        if value is not None and value != "":
+            return value
+    return None
+
+
+def _number(value) -> float:
+    if value is None:
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError:
+        return np.nan
+
+
+def load_columns(rows: List[dict], numeric: Dict[str, Sequence[str]],
+                 labels: Dict[str, Sequence[str]] = LABEL_FIELDS) -> Dict[str, np.ndarray]:
+    """Load broker rows into one numpy array per column."""
+    count = len(rows)
+    columns = {}
+    for column, names in numeric.items():
+        columns[column] = np.fromiter((_number(_field(r, names)) for r in rows), dtype=np.float64, count=count)
+    for column, names in labels.items():
+        columns[column] = np.array([str(_field(r, names) or "").upper() for r in rows], dtype=object)
+    return columns
+
+
+def group_sum(keys: np.ndarray, **values: np.ndarray) -> Dict[str, dict]:
+    """Sum each value array per distinct key."""
+    if not len(keys):
+        return {}
+    uniques, inverse = np.unique(keys, return_inverse=True)
+    sums = {name: np.bincount(inverse, weights=array, minlength=len(uniques)) for name, array in values.items()}
+    counts = np.bincount(inverse, minlength=len(uniques))
+    return {
+        str(key or "UNKNOWN"): dict({"count": int(counts[i])}, **{name: round(float(s[i]), 2) for name, s in sums.items()})
+        for i, key in enumerate(uniques)
+    }
+
+
+def position_analytics(rows: List[dict]) -> dict:
+    cols = load_columns(rows, POSITION_FIELDS)
+    qty, avg, ltp = cols["net_qty"], cols["avg_price"], cols["ltp"]
+    qty = np.nan_to_num(qty)
+    exposure = np.nan_to_num(qty * ltp)
+    computed = np.nan_to_num((ltp - avg) * qty)
+    unrealized = np.where(np.isnan(cols["unrealized"]), computed, cols["unrealized"])
+    realized = np.nan_to_num(cols["realized"])
+    return {
+        "count": len(rows),
+        "open_count": int(np.count_nonzero(qty)),
+        "net_quantity": float(qty.sum()),
+        "net_exposure": round(float(exposure.sum()), 2),
+        "gross_exposure": round(float(np.abs(exposure).sum()), 2),
+        "long_exposure": round(float(exposure[exposure > 0].sum()), 2),
+        "short_exposure": round(float(exposure[exposure < 0].sum()), 2),
+        "realized_pnl": round(float(realized.sum()), 2),
+        "unrealized_pnl": round(float(unrealized.sum()), 2),
+        "total_pnl": round(float((realized + unrealized).sum()), 2),
+        "by_product": group_sum(cols["product"], exposure=exposure, pnl=realized + unrealized),
+        "by_exchange": group_sum(cols["exchange"], exposure=exposure, pnl=realized + unrealized),
+        "_symbols": cols["symbol"],
+        "_exposure": exposure,
+    }
+
+
+def holding_analytics(rows: List[dict]) -> dict:
+    cols = load_columns(rows, HOLDING_FIELDS)
+    qty = np.nan_to_num(cols["qty"])
+    value = np.nan_to_num(qty * cols["ltp"])
+    invested = np.nan_to_num(qty * cols["avg_price"])
+    pnl = value - invested
+    total_invested = float(invested.sum())
+    return {
+        "count": len(rows),
+        "market_value": round(float(value.sum()), 2),
+        "invested": round(total_invested, 2),
+        "pnl": round(float(pnl.sum()), 2),
+        "pnl_pct": round(float(pnl.sum()) / total_invested * 100, 2) if total_invested else 0.0,
+        "by_exchange": group_sum(cols["exchange"], value=value, pnl=pnl),
+        "_symbols": cols["symbol"],
+        "_exposure": value,
+    }
+
+
+def concentration(symbols: np.ndarray, exposure: np.ndarray, top_n: int = 10) -> dict:
+    """Share of gross exposure per symbol, the top holdings and the HHI."""
+    if not len(symbols):
+        return {"top": [], "hhi": 0.0}
+    uniques, inverse = np.unique(symbols, return_inverse=True)
+    gross = np.bincount(inverse, weights=np.abs(exposure), minlength=len(uniques))
+    total = gross.sum()
+    if not total:
+        return {"top": [], "hhi": 0.0}
+    weights = gross / total
+    order = np.argsort(-weights)[:top_n]
+    return {
+        "top": [
+            {"symbol": str(uniques[i]), "exposure": round(float(gross[i]), 2), "weight": round(float(weights[i]), 4)}
+            for i in order
+        ],
+        "hhi": round(float(np.square(weights).sum()), 4),
+    }
+
+
+def portfolio_analytics(positions=None, holdings=None, top_n: int = 10) -> dict:
+    """Aggregate exposure, P&L and concentration from positions/holdings responses."""
+    result = {}
+    symbols: List[np.ndarray] = []
+    exposures: List[np.ndarray] = []
+    for name, payload, compute in (("positions", positions, position_analytics),
+                                   ("holdings", holdings, holding_analytics)):
+        if payload is None:
+            continue
+        summary = compute(extract_rows(payload))
+        symbols.append(summary.pop("_symbols"))
+        exposures.append(summary.pop("_exposure"))
+        result[name] = summary
+    if symbols:
+        result["concentration"] = concentration(np.concatenate(symbols), np.concatenate(exposures), top_n)
+    return result
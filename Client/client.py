@@ -1,11 +1,103 @@
-import socketserver, threading, webbrowser, hashlib, requests
-from typing import Optional, Union
-from .config import BASE_URL, LOGIN_URL, REDIRECT_PORT, LOGIN_TIMEOUT, APP_KEY, API_SECRET
+import socketserver, threading, webbrowser, hashlib, requests, functools, inspect, os, time
+from typing import List, Optional
+from .config import (BASE_URL, LOGIN_URL, REDIRECT_PORT, LOGIN_TIMEOUT, APP_KEY, API_SECRET, SESSION_TTL,
+                     RATE_LIMIT_PER_SEC, RATE_LIMIT_BURST, READ_CACHE_TTL, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT,
+                     CONDITIONAL_FETCH)
 from .redirect_handler import RedirectHandler
+from .storage import StoreBackend, MemoryStore, RateLimiter, ReadCache
+from .transport import HttpTransport
+from .conditional import ConditionalFetcher, wire_bytes
+from .dispatcher import FutureTimeout, PriorityDispatcher, QueueFullError, classify
+from .deadline import Deadline, DeadlineExceeded, current as current_deadline
+from .models import MODEL_FORMATS, parse_rows
+from .journal import OrderJournal
+from .tracing import current_span, get_tracer, span
+from .endpoints import ENDPOINTS, ENDPOINTS_BY_NAME, Endpoint
 from .utils import is_port_available, force_close_port, close_previous_login
 
+def cached_read(name: str):
+    """Serve a read endpoint from the shared read cache for READ_CACHE_TTL[name] seconds."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            ttl = READ_CACHE_TTL.get(name, 0)
+            if not ttl:
+                return method(self, *args, **kwargs)
+            return self.read_cache.get_or_fetch(name, ttl, lambda: method(self, *args, **kwargs))
+        return wrapper
+    return decorator
+
+def returns_model(model):
+    """Convert a read endpoint's rows to ``model`` when the client was built with ``models=``.
+
+    The same response object as last time (an unchanged conditional fetch or
+    a local cache hit) returns the previous conversion.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            payload = method(self, *args, **kwargs)
+            if self.models is None:
+                return payload
+            last = self._model_memo.get(model)
+            if last is not None and last[0] is payload:
+                return last[1]
+            result = parse_rows(payload, model, self.models)
+            self._model_memo[model] = (payload, result)
+            return result
+        return wrapper
+    return decorator
+
+def is_auth_failure(res) -> bool:
+    """True for a 401 or a broker body reporting an invalid/expired session."""
+    if res.status_code == 401:
+        return True
+    # Session errors are short; never decode a large book just to rule one out
+    if len(res.content) > 512:
+        return False
+    text = res.text
+    if "session" not in text.lower():
+        return False
+    try:
+        data = res.json()
+    except ValueError:
+        return False
+    if not isinstance(data, dict) or data.get("stat") == "Ok":
+        return False
+    message = str(data.get("emsg") or data.get("message") or "").lower()
+    return "session" in message and any(word in message for word in ("expired", "invalid", "not valid"))
+
+def _describe_response(http_span, res) -> None:
+    """Status, size and time to response headers on an HTTP span."""
+    if http_span is None:
+        return
+    http_span.set(status=res.status_code)
+    content = getattr(res, "content", None)
+    if content is not None:
+        http_span.set(bytes=len(content), wire_bytes=wire_bytes(res))
+    elapsed = getattr(res, "elapsed", None)
+    if elapsed is not None:
+        http_span.set(headers_ms=round(elapsed.total_seconds() * 1000, 3))
+
+def invalidates_reads(method):
+    """Drop cached reads after a write so no replica serves pre-write state."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.read_cache.invalidate(*READ_CACHE_TTL)
+    return wrapper
+
 class AliceBlue:
-    def __init__(self, app_key: str, api_secret: str):
+    def __init__(self, app_key: str, api_secret: str, store: Optional[StoreBackend] = None, transport=None,
+                 dispatcher: Optional[PriorityDispatcher] = None, models: Optional[str] = None,
+                 journal: Optional[OrderJournal] = None):
+        """``models`` selects the return form of book/position/holding reads: None for the raw
+        JSON, "objects" for lists of slotted models, "columnar" for a ModelTable. ``journal``
+        receives every order-changing call with its response and latency."""
+        if models not in MODEL_FORMATS:
+            raise ValueError(f"models must be one of {MODEL_FORMATS}")
         self.app_key = app_key
         self.api_secret = api_secret
         self.user_id = None
@@ -15,6 +107,294 @@ class AliceBlue:
         self.login_timeout = LOGIN_TIMEOUT
         self.current_server = None
         self.server_thread = None
+        self.store = store or MemoryStore()
+        self.transport = transport or HttpTransport()
+        self.dispatcher = dispatcher
+        self.models = models
+        self.journal = journal
+        self.fetcher = ConditionalFetcher() if CONDITIONAL_FETCH else None
+        self._model_memo = {}
+        self.read_cache = ReadCache(self.store, f"cache:{app_key}")
+        self.limiter = RateLimiter(self.store, f"ratelimit:{app_key}", RATE_LIMIT_PER_SEC, RATE_LIMIT_BURST)
+        self._auth_lock = threading.Lock()
+        self._auth_ready = threading.Event()
+        self._auth_ready.set()
+        self.reauth_count = 0
+
+    @property
+    def session_key(self) -> str:
+        return f"session:{self.app_key}"
+
+    def load_shared_session(self) -> bool:
+        """Adopt a session another replica already created, if the store has one."""
+        shared = self.store.get(self.session_key)
+        if not shared:
+            return False
+        self.user_session = shared["user_session"]
+        self.user_id = shared.get("user_id")
+        self.headers = {"Authorization": f"Bearer {self.user_session}"}
+        return True
+
+    def _send(self, method: str, url: str, priority: Optional[int] = None, **kwargs):
+        """Single exit point for broker API calls; draws from the shared rate budget.
+
+        An expired session triggers one shared re-authentication, after which
+        the request is replayed once with the new token. Under a deadline
+        (see ``deadline_scope``) every stage only gets the budget that is left.
+        """
+        deadline = current_deadline()
+        # Hold new requests while a re-login is in flight instead of sending a stale token
+        if not self._auth_ready.is_set():
+            with span("auth_wait"):
+                ready = self._auth_ready.wait(timeout=self.login_timeout if deadline is None
+                                              else deadline.cap(self.login_timeout))
+            if not ready and deadline is not None and deadline.expired:
+                raise DeadlineExceeded("auth_wait", deadline)
+        session = self.user_session
+        res = self._dispatch(method, url, priority, **kwargs)
+        if session and is_auth_failure(res):
+            if deadline is not None:
+                deadline.check("auth")
+            with span("reauth"):
+                self.reauthenticate(stale_session=session)
+            if deadline is not None:
+                deadline.check("retry")
+            res = self._dispatch(method, url, priority, attempt=2, **kwargs)
+        return res
+
+    def _request(self, method: str, url: str, deadline: Optional[Deadline], parent=None, enqueued=None,
+                 attempt: int = 1, **kwargs):
+        if enqueued is not None:
+            get_tracer().record("dispatch_queue", enqueued, time.perf_counter(), parent)
+        extra = kwargs.pop("headers", None)
+        headers = self.headers if not extra else dict(self.headers or {}, **extra)
+        if deadline is None:
+            with span("rate_limit", parent):
+                self.limiter.acquire()
+            with span("http", parent, method=method, path=url[len(BASE_URL):], attempt=attempt) as http:
+                res = self.transport.request(method, url, headers=headers,
+                                             timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT), **kwargs)
+                _describe_response(http, res)
+            return res
+        # A job that sat in the queue past its deadline never reaches the broker
+        deadline.check("dispatch")
+        with span("rate_limit", parent):
+            self.limiter.acquire(deadline=deadline)
+        remaining = deadline.check("rate_limit")
+        with span("http", parent, method=method, path=url[len(BASE_URL):], attempt=attempt) as http:
+            try:
+                res = self.transport.request(method, url, headers=headers,
+                                             timeout=(min(HTTP_CONNECT_TIMEOUT, remaining), min(HTTP_READ_TIMEOUT, remaining)),
+                                             **kwargs)
+            except requests.exceptions.ConnectTimeout:
+                if deadline.expired:
+                    raise DeadlineExceeded("http_connect", deadline)
+                raise
+            except requests.exceptions.ReadTimeout:
+                if deadline.expired:
+                    raise DeadlineExceeded("http_read", deadline)
+                raise
+            _describe_response(http, res)
+        return res
+
+    def _dispatch(self, method: str, url: str, priority: Optional[int] = None, attempt: int = 1, **kwargs):
+        # Read the deadline and span here: dispatcher workers do not see the caller's context
+        deadline = current_deadline()
+        parent = current_span()
+        if self.dispatcher is None:
+            return self._request(method, url, deadline, parent, attempt=attempt, **kwargs)
+        enqueued = time.perf_counter()
+        call = lambda: self._request(method, url, deadline, parent, enqueued, attempt, **kwargs)
+        priority = classify(url) if priority is None else priority
+        # Rate tokens are taken on the worker, so urgent classes also get the budget first
+        if deadline is None:
+            return self.dispatcher.run(priority, call)
+        try:
+            return self.dispatcher.run(priority, call, timeout=deadline.check("dispatch"))
+        except (FutureTimeout, QueueFullError):
+            if deadline.expired:
+                raise DeadlineExceeded("dispatch", deadline)
+            raise
+
+    def _call(self, endpoint: Endpoint, payload=None):
+        """Send one registry endpoint and decode its JSON response; writes are journaled."""
+        if self.journal is None or not endpoint.write:
+            return self._exchange(endpoint, payload)
+        started = time.time()
+        t0 = time.perf_counter()
+        try:
+            response = self._exchange(endpoint, payload)
+        except Exception as e:
+            self.journal.record(endpoint.name, payload, error=str(e),
+                                latency_ms=round((time.perf_counter() - t0) * 1000, 2), started=started)
+            raise
+        self.journal.record(endpoint.name, payload, response,
+                            latency_ms=round((time.perf_counter() - t0) * 1000, 2), started=started)
+        return response
+
+    def _exchange(self, endpoint: Endpoint, payload=None):
+        url = f"{BASE_URL}{endpoint.path}"
+        if endpoint.conditional and self.fetcher is not None:
+            return self._fetch(endpoint, url)
+        kwargs = {} if payload is None else {"json": payload}
+        if endpoint.detailed_errors:
+            try:
+                res = self._send(endpoint.method, url, endpoint.priority, **kwargs)
+                res.raise_for_status()
+                with span("decode"):
+                    return res.json()
+            except requests.exceptions.HTTPError:
+                try:
+                    error_data = res.json()
+                    error_msg = error_data.get("message") or error_data.get("emsg") or res.text
+                except Exception:
+                    error_msg = res.text
+                raise Exception(f"{endpoint.label} {res.status_code}: {error_msg}")
+            except requests.exceptions.RequestException as e:
+                raise Exception(f"Network error: {str(e)}")
+
+        res = self._send(endpoint.method, url, endpoint.priority, **kwargs)
+        if res.status_code != 200:
+            raise Exception(f"{endpoint.label} {res.status_code}: {res.text}")
+        try:
+            with span("decode"):
+                return res.json()
+        except Exception:
+            raise Exception(f"Non-JSON response: {res.text}")
+
+    def _fetch(self, endpoint: Endpoint, url: str, conditional: bool = True):
+        """GET a large book through the conditional fetcher; unchanged books come back as the same object."""
+        headers = self.fetcher.headers(endpoint.name if conditional else None)
+        res = self._send(endpoint.method, url, endpoint.priority, headers=headers)
+        if res.status_code not in (200, 304):
+            raise Exception(f"{endpoint.label} {res.status_code}: {res.text}")
+        try:
+            with span("decode") as decode:
+                value, result = self.fetcher.resolve(endpoint.name, res)
+                if decode is not None:
+                    decode.set(result=result)
+        except ValueError:
+            raise Exception(f"Non-JSON response: {res.text}")
+        if result is None:
+            # Nothing kept to reuse (e.g. after forget()); ask again without validators
+            if not conditional:
+                raise Exception(f"{endpoint.label} 304 for an unconditional request")
+            return self._fetch(endpoint, url, conditional=False)
+        return value
+
+    def fetch(self, name: str, **kwargs):
+        """Call a read endpoint straight at the broker: no read cache, raw JSON whatever ``models`` is."""
+        endpoint = ENDPOINTS_BY_NAME[name]
+        bound = endpoint.signature.bind(**kwargs)
+        bound.apply_defaults()
+        return self._call(endpoint, endpoint.payload(bound.arguments))
+
+    def batch(self, name: str, items: List[dict]):
+        """Call an endpoint for several argument sets.
+
+        Endpoints whose payload is the broker's array form send every item in
+        one request; the rest are called once per item, and a deadline hit
+        part-way raises ``DeadlineExceeded`` with the finished results as
+        ``partial``.
+        """
+        endpoint = ENDPOINTS_BY_NAME[name]
+        if not endpoint.batchable:
+            method = getattr(self, name)
+            results = []
+            for item in items:
+                try:
+                    results.append(method(**item))
+                except DeadlineExceeded as e:
+                    # Hand back what completed; the rest were not sent
+                    e.partial = results
+                    raise
+            return results
+        payload = []
+        for item in items:
+            bound = endpoint.signature.bind(**item)
+            bound.apply_defaults()
+            payload.append(endpoint.item(bound.arguments))
+        try:
+            return self._call(endpoint, payload)
+        finally:
+            if endpoint.write:
+                self.read_cache.invalidate(*READ_CACHE_TTL)
+
+    def reauthenticate(self, stale_session: str):
+        """Replace an expired session exactly once, however many callers saw it expire.
+
+        Under a deadline, waiting for another caller's re-login stops when the budget does.
+        """
+        deadline = current_deadline()
+        if deadline is None:
+            self._auth_lock.acquire()
+        elif not self._auth_lock.acquire(timeout=deadline.remaining()):
+            raise DeadlineExceeded("auth_wait", deadline)
+        try:
+            if self.user_session != stale_session:
+                return
+            self._auth_ready.clear()
+            try:
+                shared = self.store.get(self.session_key)
+                if shared and shared.get("user_session") != stale_session:
+                    self.load_shared_session()
+                    return
+                print("🔐 Session expired, re-authenticating...")
+                self.store.delete(self.session_key)
+                self.user_session = None
+                self.headers = None
+                self.authenticate_once(stale_session=stale_session)
+                self.reauth_count += 1
+            finally:
+                self._auth_ready.set()
+        finally:
+            self._auth_lock.release()
+
+    def authenticate_once(self, stale_session: Optional[str] = None):
+        """Log in once across every process sharing the store.
+
+        The caller that takes the store's login lock runs the login; the rest
+        wait for the session it publishes instead of opening more browser logins.
+        Under a deadline, waiting for another worker's login and the session
+        exchange stop when the budget does. The browser login itself always
+        gets LOGIN_TIMEOUT, and its authCode is kept for the next call if the
+        exchange then runs out of time.
+        """
+        def adopt_shared() -> bool:
+            shared = self.store.get(self.session_key)
+            return bool(shared and shared.get("user_session") != stale_session) and self.load_shared_session()
+
+        deadline = current_deadline()
+        lock_key = f"login:{self.app_key}"
+        lock_ttl = self.login_timeout + 30
+        give_up = time.monotonic() + (lock_ttl if deadline is None else deadline.cap(lock_ttl))
+        while time.monotonic() < give_up:
+            if adopt_shared():
+                return
+            if self.store.add(lock_key, os.getpid(), lock_ttl):
+                try:
+                    # The previous holder may have published a session just before releasing the lock
+                    if adopt_shared():
+                        return
+                    if deadline is not None:
+                        deadline.check("auth")
+                    self.authenticate()
+                    return
+                except DeadlineExceeded:
+                    raise
+                except Exception:
+                    if stale_session is None:
+                        raise
+                    # The stored authCode is usually spent by now; go through login again
+                    self.auth_code = None
+                    self.authenticate()
+                    return
+                finally:
+                    self.store.delete(lock_key)
+            time.sleep(0.2)
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceeded("auth", deadline)
+        raise TimeoutError("Login timeout: another worker's login did not complete")
 
     def login_and_get_auth_code(self):
         close_previous_login(self.current_server)
@@ -33,13 +413,15 @@ class AliceBlue:
             self.current_server.server_activate()
             RedirectHandler.current_server = self.current_server
 
-            self.server_thread = threading.Thread(target=self.current_server.serve_forever, daemon=True)
+            self.server_thread = threading.Thread(target=self.current_server.serve_forever, name="login-redirect",
+                                                  daemon=True)
             self.server_thread.start()
 
             login_url = f"{LOGIN_URL}{self.app_key}"
             print(f"Opening browser for login: {login_url}")
             webbrowser.open(login_url)
 
+            # The user is typing in a browser: give them LOGIN_TIMEOUT whatever the call's deadline
             print(f"Waiting for login (timeout: {self.login_timeout} seconds)...")
             login_success = RedirectHandler.login_received.wait(timeout=self.login_timeout)
 
@@ -69,7 +451,13 @@ class AliceBlue:
         checksum = hashlib.sha256(raw_string.encode()).hexdigest()
         url = f"{BASE_URL}/open-api/od/v1/vendor/getUserDetails"
         payload = {"checkSum": checksum}
-        res = requests.post(url, json=payload)
+        deadline = current_deadline()
+        self.limiter.acquire(deadline=deadline)
+        timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+        if deadline is not None:
+            remaining = deadline.check("auth")
+            timeout = (min(HTTP_CONNECT_TIMEOUT, remaining), min(HTTP_READ_TIMEOUT, remaining))
+        res = self.transport.request("POST", url, json=payload, timeout=timeout)
 
         if res.status_code != 200:
             raise Exception(f"API Error: {res.text}")
@@ -78,6 +466,7 @@ class AliceBlue:
         if data.get("stat") == "Ok":
             self.user_session = data["userSession"]
             self.headers = {"Authorization": f"Bearer {self.user_session}"}
+            self.store.set(self.session_key, {"user_session": self.user_session, "user_id": self.user_id}, SESSION_TTL)
             print("Authentication Successful")
         else:
             raise Exception(f"Authentication failed: {data}")
@@ -88,329 +477,29 @@ class AliceBlue:
     def close(self):
         """Cleanup method to close any ongoing login attempts"""
         self.close_previous_login()
-    
 
-    def get_profile(self):
-        url = f"{BASE_URL}/open-api/od/v1/profile"
-        res = requests.get(url, headers=self.headers)
-        
-        if res.status_code != 200:
-            raise Exception(f"Profile Error {res.status_code}: {res.text}")
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
-    
-    def get_holdings(self):
-        url = f"{BASE_URL}/open-api/od/v1/holdings/CNC"
-        res = requests.get(url, headers=self.headers)
-        
-        if res.status_code != 200:
-            raise Exception(f"Holding Error {res.status_code}: {res.text}")
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
-    
-    def get_positions(self):
-        url = f"{BASE_URL}/open-api/od/v1/positions"
-        res = requests.get(url, headers=self.headers)
-        
-        if res.status_code != 200:
-            raise Exception(f"Position Error {res.status_code}: {res.text}")
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
-    
-    def get_positions_sqroff(self, exch, symbol, qty, product, transaction_type):
-        url = f"{BASE_URL}/open-api/od/v1/orders/positions/sqroff"
-        payload = {
-            "exch": exch,
-            "symbol": symbol,
-            "qty": qty,
-            "product": product,
-            "transaction_type": transaction_type
-        }
-        res = requests.post(url, headers=self.headers, json=payload)
-        
-        if res.status_code != 200:
-            raise Exception(f"Position Square Off Error {res.status_code}: {res.text}")
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
 
-    def get_position_conversion(self, exchange, validity, prevProduct, product, quantity, tradingSymbol, transactionType,orderSource):
-        url = f"{BASE_URL}/open-api/od/v1/conversion"
-        payload = {
-            "exchange": exchange,
-            "validity": validity,
-            "prevProduct": prevProduct,
-            "product": product,
-            "quantity": quantity,
-            "tradingSymbol": tradingSymbol,
-            "transactionType": transactionType,
-            "orderSource":orderSource
-        }
-        res = requests.post(url, headers=self.headers, json=payload)
-        
-        if res.status_code != 200:
-            raise Exception(f"Position Conversion Error {res.status_code}: {res.text}")
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
-    
-    def get_place_order(self,instrument_id: str, exchange: str, transaction_type: str, quantity: int, order_type: str, product: str,
-                    order_complexity: str, price: float, validity: str, sl_leg_price: Optional[float] = None,
-                    target_leg_price: Optional[float] = None, sl_trigger_price: Optional[float] = None, trailing_sl_amount: Optional[float] = None,
-                    disclosed_quantity: int = 0,source: str = "API"):
-        """Place an order with Alice Blue API."""
-
-        url = f"{BASE_URL}/open-api/od/v1/orders/placeorder"
-
-        payload = [{
-            "instrumentId": instrument_id,
-            "exchange": exchange,
-            "transactionType": transaction_type.upper(),
-            "quantity": quantity,
-            "orderType": order_type.upper(),
-            "product": product.upper(),
-            "orderComplexity": order_complexity.upper(),
-            "price": price,
-            "validity": validity.upper(),
-            "disclosedQuantity": disclosed_quantity,
-            "source": source.upper()
-        }]
-
-        if sl_leg_price is not None:
-            payload[0]["slLegPrice"] = sl_leg_price
-        if target_leg_price is not None:
-            payload[0]["targetLegPrice"] = target_leg_price
-        if sl_trigger_price is not None:
-            payload[0]["slTriggerPrice"] = sl_trigger_price
-        if trailing_sl_amount is not None:
-            payload[0]["trailingSlAmount"] = trailing_sl_amount
-
-        res = requests.post(url, headers=self.headers, json=payload)
+def _endpoint_method(endpoint: Endpoint):
+    """Build the AliceBlue method for a registry endpoint."""
+    signature = endpoint.signature
 
-        if res.status_code != 200:
-            raise Exception(f"Order Place Error {res.status_code}: {res.text}")
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
-    
-    def get_order_book(self):
-        url = f"{BASE_URL}/open-api/od/v1/orders/book"
-        res = requests.get(url, headers=self.headers)
-        
-        if res.status_code != 200:
-            raise Exception(f"Order Book Error {res.status_code}: {res.text}")
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
-    
-    def get_order_history(self, brokerOrderId: str):
-        url = f"{BASE_URL}/open-api/od/v1/orders/history"
-        payload = {"brokerOrderId": brokerOrderId}
-        res = requests.post(url, headers=self.headers, json = payload)
-        
-        if res.status_code != 200:
-            raise Exception(f"Order History Error {res.status_code}: {res.text}")
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
-    
-    def get_modify_order(self, brokerOrderId:str, validity: str , quantity: Optional[int] = None,price: Optional[Union[int, float]] = None, 
-                         triggerPrice: Optional[float] = None
-                         ):
-        url = f"{BASE_URL}/open-api/od/v1/orders/modify"
-        payload = [{
-            "brokerOrderId": brokerOrderId,
-            "quantity": quantity if quantity else "",
-            "price": price if price else "",
-            "triggerPrice": triggerPrice if triggerPrice else "",
-            "validity": validity.upper()
-        }]
-        res = requests.post(url, headers=self.headers, json=payload)
-        if res.status_code != 200:
-            raise Exception(f"Order Modify Error {res.status_code}: {res.text}")
+    def method(self, *args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return self._call(endpoint, endpoint.payload(bound.arguments))
 
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
-    
-    def get_cancel_order(self, brokerOrderId):
-        """Cancel an order."""
-        url = f"{BASE_URL}/open-api/od/v1/orders/cancel"
-        payload = {"brokerOrderId":brokerOrderId}
-        res = requests.post(url, headers=self.headers, json=payload)
-        
-        if res.status_code != 200:
-            raise Exception(f"Order Cancel Error {res.status_code}: {res.text}")
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
-    
-    def get_trade_book(self):
-        url = f"{BASE_URL}/open-api/od/v1/orders/trades"
-        res = requests.get(url, headers=self.headers)
-        
-        if res.status_code != 200:
-            raise Exception(f"Order Cancel Error {res.status_code}: {res.text}")
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
-    
-    def get_order_margin(self, exchange:str, instrumentId:str, transactionType:str, quantity:int, product:str, 
-                         orderComplexity:str, orderType:str, validity:str, price=0.0, slTriggerPrice: Optional[Union[int, float]] = None):
-        url = f"{BASE_URL}/open-api/od/v1/orders/checkMargin"
-        payload = [{
-            "exchange": exchange.upper(),
-            "instrumentId": instrumentId.upper(),
-            "transactionType": transactionType.upper(),
-            "quantity": quantity,
-            "product": product.upper(),
-            "orderComplexity": orderComplexity.upper(),
-            "orderType": orderType.upper(),
-            "price": price,
-            "validity": validity.upper(),
-            "slTriggerPrice": slTriggerPrice if slTriggerPrice is not None else ""
-        }]
-        res = requests.post(url, headers=self.headers, json=payload)
-        
-        if res.status_code != 200:
-            raise Exception(f"Order Cancel Error {res.status_code}: {res.text}")
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
-    
-    def get_exit_bracket_order(self, brokerOrderId: str, orderComplexity: str):
-        url = f"{BASE_URL}/open-api/od/v1/orders/exit/sno"
-        payload = [{
-            "brokerOrderId": brokerOrderId,
-            "orderComplexity": orderComplexity.upper()
-        }]
-        res = requests.post(url, headers=self.headers, json=payload)
-        
-        if res.status_code != 200:
-            raise Exception(f"Exit Bracket Order Error {res.status_code}: {res.text}")
-        
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
-    
-    def get_place_gtt_order(self, tradingSymbol: str, exchange: str, transactionType: str, orderType: str,
-                            product: str, validity: str, quantity: int, price: float, orderComplexity: str, 
-                            instrumentId: str, gttType: str, gttValue: float):
-        
-        url = f"{BASE_URL}/open-api/od/v1/orders/gtt/execute"
-        
-        payload = {
-            "tradingSymbol": tradingSymbol.upper(),
-            "exchange": exchange.upper(),
-            "transactionType": transactionType.upper(),
-            "orderType": orderType.upper(),
-            "product": product.upper(),
-            "validity": validity.upper(),
-            "quantity": quantity, 
-            "price": price, 
-            "orderComplexity": orderComplexity.upper(),
-            "instrumentId": instrumentId,
-            "gttType": gttType.upper(),
-            "gttValue": gttValue 
-        }
-        try:
-            res = requests.post(url, headers=self.headers, json=payload)
-            res.raise_for_status()
-            return res.json()
-        except requests.exceptions.HTTPError as e:
-            try:
-                error_data = res.json()
-                error_msg = error_data.get("message") or error_data.get("emsg") or res.text
-            except:
-                error_msg = res.text
-            raise Exception(f"GTT Order Place Error {res.status_code}: {error_msg}")
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Network error: {str(e)}")
-    
-    def get_gtt_order_book(self):
-        url = f"{BASE_URL}/open-api/od/v1/orders/gtt/orderbook"
-        res = requests.get(url, headers=self.headers)
-        
-        if res.status_code != 200:
-            raise Exception(f"GTT Order Book Error {res.status_code}: {res.text}")
-        
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
-    
-    def get_modify_gtt_order(self, brokerOrderId: str, instrumentId: str, tradingSymbol: str, 
-                            exchange: str, orderType: str, product: str, validity: str, 
-                            quantity: int, price: float, orderComplexity: str, 
-                            gttType: str, gttValue: float):
-        
-        url = f"{BASE_URL}/open-api/od/v1/orders/gtt/modify"
-        
-        payload = {
-            "brokerOrderId": brokerOrderId,
-            "instrumentId": instrumentId,
-            "tradingSymbol": tradingSymbol.upper(),
-            "exchange": exchange.upper(),
-            "orderType": orderType.upper(),
-            "product": product.upper(),
-            "validity": validity.upper(),
-            "quantity": quantity,
-            "price": price,
-            "orderComplexity": orderComplexity.upper(),
-            "gttType": gttType.upper(),
-            "gttValue": gttValue
-        }
-        
-        try:
-            res = requests.post(url, headers=self.headers, json=payload)
-            res.raise_for_status()
-            return res.json()
-            
-        except requests.exceptions.HTTPError as e:
-            try:
-                error_data = res.json()
-                error_msg = error_data.get("message") or error_data.get("emsg") or res.text
-            except:
-                error_msg = res.text
-            raise Exception(f"GTT Modify Order Error {res.status_code}: {error_msg}")
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Network error: {str(e)}")
-    
-    def get_cancel_gtt_order(self, brokerOrderId):
-        url = f"{BASE_URL}/open-api/od/v1/orders/gtt/cancel"
-        payload = {"brokerOrderId": brokerOrderId}
-        res = requests.post(url, headers=self.headers, json=payload)
-        
-        if res.status_code != 200:
-            raise Exception(f"GTT Cancel Order Error {res.status_code}: {res.text}")
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
-    
-    def get_limits(self):
-        url = f"{BASE_URL}/open-api/od/v1/limits"
-        res = requests.get(url, headers=self.headers)
-        
-        if res.status_code != 200:
-            raise Exception(f"Exit Bracket Order Error {res.status_code}: {res.text}")   
-        try:
-            return res.json()
-        except Exception:
-            raise Exception(f"Non-JSON response: {res.text}")
+    if endpoint.cache:
+        method = cached_read(endpoint.cache)(method)
+    if endpoint.model is not None:
+        method = returns_model(endpoint.model)(method)
+    if endpoint.write:
+        method = invalidates_reads(method)
+    method.__name__ = method.__qualname__ = endpoint.name
+    method.__doc__ = endpoint.doc
+    method.__signature__ = signature.replace(
+        parameters=[inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD)] + list(signature.parameters.values())
+    )
+    return method
+
+for _endpoint in ENDPOINTS:
+    setattr(AliceBlue, _endpoint.name, _endpoint_method(_endpoint))
@@ -0,0 +1,144 @@
+import hashlib
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+# requests/urllib3 decode these transparently; br/zstd only when their optional packages are installed
+ACCEPT_ENCODING = "gzip, deflate"
+
+NOT_MODIFIED = "not_modified"  # 304: the broker confirmed our validators
+UNCHANGED = "unchanged"        # 200 with a body identical to the last one
+PARSED = "parsed"              # new body, decoded
+
+
+def wire_bytes(res) -> int:
+    """Bytes read off the socket (compressed size when the body was encoded)."""
+    raw = getattr(res, "raw", None)
+    if raw is not None and hasattr(raw, "tell"):
+        try:
+            return raw.tell()
+        except Exception:
+            pass
+    length = res.headers.get("Content-Length")
+    if length and length.isdigit():
+        return int(length)
+    return len(res.content)
+
+
+class _Entry:
+    __slots__ = ("etag", "last_modified", "digest", "value")
+
+    def __init__(self, etag, last_modified, digest, value):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        self.value = value
+
+
+class _EndpointStats:
+    def __init__(self, window: int):
+        self.calls = 0
+        self.results = {NOT_MODIFIED: 0, UNCHANGED: 0, PARSED: 0}
+        self.wire_bytes = 0
+        self.body_bytes = 0
+        self.compressed = 0
+        self.parse_ms = 0.0
+        self.recent = deque(maxlen=window)
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "results": dict(self.results),
+            "wire_bytes": self.wire_bytes,
+            "body_bytes": self.body_bytes,
+            "compressed_responses": self.compressed,
+            "parse_ms": round(self.parse_ms, 3),
+            "avg_wire_bytes": round(self.wire_bytes / self.calls) if self.calls else 0,
+            "recent": list(self.recent),
+        }
+
+
+class ConditionalFetcher:
+    """Conditional GETs with a local fallback for large, slowly changing reads.
+
+    The last decoded body of each endpoint is kept with its ``ETag``,
+    ``Last-Modified`` and a hash of the raw bytes. Requests carry
+    ``If-None-Match``/``If-Modified-Since`` when the broker sent validators,
+    and a 304 returns the kept value. Brokers without validators still send
+    the body, but an identical hash skips decoding and returns the very same
+    object, so memoised conversions downstream are reused too. Returned
+    values are shared between calls and must be treated as read-only.
+    """
+
+    def __init__(self, window: int = 50):
+        self.window = window
+        self._entries: Dict[str, _Entry] = {}
+        self._stats: Dict[str, _EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def headers(self, name: Optional[str]) -> dict:
+        """Request headers for ``name``; None gives an unconditional request."""
+        headers = {"Accept-Encoding": ACCEPT_ENCODING}
+        entry = self._entries.get(name)
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def resolve(self, name: str, res):
+        """Decoded value of ``res`` and how it was obtained (``result`` None for a 304 with nothing kept).
+
+        Raises ValueError for a body that is not JSON.
+        """
+        entry = self._entries.get(name)
+        parse_ms = 0.0
+        body = b"" if res.status_code == 304 else res.content
+        if res.status_code == 304:
+            if entry is None:
+                return None, None
+            value, result = entry.value, NOT_MODIFIED
+        else:
+            digest = hashlib.blake2b(body, digest_size=16).digest()
+            if entry is not None and entry.digest == digest:
+                value, result = entry.value, UNCHANGED
+            else:
+                t0 = time.perf_counter()
+                value = res.json()
+                parse_ms = (time.perf_counter() - t0) * 1000
+                result = PARSED
+            entry = _Entry(res.headers.get("ETag"), res.headers.get("Last-Modified"), digest, value)
+            self._entries[name] = entry
+        self._record(name, res, result, len(body), parse_ms)
+        return value, result
+
+    def _record(self, name: str, res, result: str, body_bytes: int, parse_ms: float) -> None:
+        wire = wire_bytes(res) if body_bytes else 0
+        encoding = res.headers.get("Content-Encoding")
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _EndpointStats(self.window)
+            stats.calls += 1
+            stats.results[result] += 1
+            stats.wire_bytes += wire
+            stats.body_bytes += body_bytes
+            stats.parse_ms += parse_ms
+            if encoding:
+                stats.compressed += 1
+            stats.recent.append({"ts": round(time.time(), 3), "status": res.status_code, "result": result,
+                                 "wire_bytes": wire, "body_bytes": body_bytes, "encoding": encoding,
+                                 "parse_ms": round(parse_ms, 3)})
+
+    def forget(self, name: Optional[str] = None) -> None:
+        """Drop kept bodies (all of them without ``name``); the next fetch is unconditional."""
+        if name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(name, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {name: stats.snapshot() for name, stats in self._stats.items()}
@@ -1,7 +1,7 @@
 # In Client/config.py - Add cloud support
 import os
 
-BASE_URL = "https://a3.aliceblueonline.com"
+BASE_URL = os.getenv("BASE_URL", "https://a3.aliceblueonline.com")
 LOGIN_URL = "https://ant.aliceblueonline.com/?appcode="
 
 # Use environment variable for redirect in cloud, fallback to localhost for local dev
@@ -10,4 +10,81 @@ REDIRECT_PORT = 8080
 LOGIN_TIMEOUT = 60
 
 APP_KEY = os.getenv("APP_KEY", "OzbVrZLlNu")
-API_SECRET = os.getenv("API_SECRET", "7Y16z4GR8xEiv1hwpBLqZ4CnOyxGEhgxt60RtCThj5ngwfuHpzqNgVoeNPPVco3oWvkhhaC4LRO8K2SLjG9ABVCj3rt5M8kS1F8M")
\ No newline at end of file
+API_SECRET = os.getenv("API_SECRET", "7Y16z4GR8xEiv1hwpBLqZ4CnOyxGEhgxt60RtCThj5ngwfuHpzqNgVoeNPPVco3oWvkhhaC4LRO8K2SLjG9ABVCj3rt5M8kS1F8M")
+
+# Shared state for sessions, read caches and rate limits.
+# "memory://" keeps it per process; "tcp://host:port" points every replica at one StoreServer.
+STORE_URL = os.getenv("STORE_URL", "memory://")
+SESSION_TTL = int(os.getenv("SESSION_TTL", "28800"))
+
+# Upstream request budget shared by every replica using the same store
+RATE_LIMIT_PER_SEC = float(os.getenv("RATE_LIMIT_PER_SEC", "10"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "20"))
+
+# Seconds a read response may be served from the cache; writes invalidate them all
+READ_CACHE_TTL = {
+    "profile": 300,
+    "holdings": 5,
+    "positions": 1,
+    "order_book": 0.5,
+    "trade_book": 1,
+    "gtt_order_book": 1,
+    "limits": 2,
+}
+
+# Capture broker traffic to a JSONL log (".gz" to compress), or serve a capture back instead of the broker
+RECORD_PATH = os.getenv("RECORD_PATH", "")
+REPLAY_PATH = os.getenv("REPLAY_PATH", "")
+REPLAY_LATENCY_SCALE = float(os.getenv("REPLAY_LATENCY_SCALE", "1.0"))
+
+# Priority dispatch of broker calls (0 workers sends directly from the calling thread)
+DISPATCH_WORKERS = int(os.getenv("DISPATCH_WORKERS", "4"))
+DISPATCH_QUEUE_SIZE = int(os.getenv("DISPATCH_QUEUE_SIZE", "256"))
+DISPATCH_STARVATION_MS = float(os.getenv("DISPATCH_STARVATION_MS", "2000"))
+
+# Longest a single wait_for_order_status call may block a tool worker
+ORDER_WAIT_MAX_TIMEOUT = float(os.getenv("ORDER_WAIT_MAX_TIMEOUT", "120"))
+
+# Socket timeouts for broker HTTP calls; a call's deadline shortens them further
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+
+# Time budget in seconds per MCP tool call; a tool's deadline_ms argument overrides it.
+# The margin is kept back so the timeout result is returned inside the budget.
+DEFAULT_TOOL_DEADLINE = float(os.getenv("DEFAULT_TOOL_DEADLINE", "15"))
+TOOL_DEADLINES = {
+    "place_order": 10,
+    "get_modify_order": 10,
+    "get_cancel_order": 8,
+    "get_positions_sqroff": 8,
+    "get_exit_bracket_order": 8,
+    "get_cancel_gtt_order": 8,
+    "get_portfolio_analytics": 20,
+    "bulk_place_gtt_orders": 60,
+    "bulk_modify_gtt_orders": 60,
+    "bulk_cancel_gtt_orders": 60,
+}
+DEADLINE_MARGIN_MS = float(os.getenv("DEADLINE_MARGIN_MS", "50"))
+
+# Market-data websocket
+FEED_URL = os.getenv("FEED_URL", "wss://ws1.aliceblueonline.com/NorenWS/")
+
+# Multi-worker serving (Server/multiworker.py); 0 workers means one per CPU.
+# MULTIWORKER is set for the worker processes it starts.
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "0"))
+MULTIWORKER = os.getenv("MULTIWORKER", "") == "1"
+
+# Write-behind journal of order requests and responses ("" disables it)
+JOURNAL_DIR = os.getenv("JOURNAL_DIR", "")
+JOURNAL_FSYNC_MS = float(os.getenv("JOURNAL_FSYNC_MS", "200"))
+JOURNAL_SEGMENT_MB = int(os.getenv("JOURNAL_SEGMENT_MB", "64"))
+
+# Conditional GETs (ETag/Last-Modified, else a local body hash) for the large book reads
+CONDITIONAL_FETCH = os.getenv("CONDITIONAL_FETCH", "1") != "0"
+
+# Tracing: share of tool calls traced span by span, ring buffer of calls slower than TRACE_SLOW_MS,
+# and an optional collector URL that receives sampled traces as JSON
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+TRACE_SLOW_MS = float(os.getenv("TRACE_SLOW_MS", "500"))
+TRACE_BUFFER = int(os.getenv("TRACE_BUFFER", "200"))
+TRACE_EXPORT_URL = os.getenv("TRACE_EXPORT_URL", "")
@@ -0,0 +1,73 @@
+import contextlib
+import contextvars
+import time
+from typing import Optional
+
+_current: contextvars.ContextVar = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """The call's time budget ran out; ``stage`` names where it was spent.
+
+    ``partial`` carries whatever a batch call completed before the deadline.
+    """
+
+    def __init__(self, stage: str, deadline: Optional["Deadline"] = None, partial=None):
+        self.stage = stage
+        self.deadline = deadline
+        self.partial = partial
+        super().__init__(f"Deadline exceeded during {stage}")
+
+
+class Deadline:
+    """An absolute point on the monotonic clock that every stage of a call counts down to."""
+
+    __slots__ = ("budget", "started", "at")
+
+    def __init__(self, seconds: float):
+        self.budget = seconds
+        self.started = time.monotonic()
+        self.at = self.started + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.at - time.monotonic())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.at
+
+    def check(self, stage: str) -> float:
+        """Raise if the budget is spent before ``stage``; otherwise return the seconds left."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(stage, self)
+        return remaining
+
+    def cap(self, seconds: Optional[float]) -> float:
+        """``seconds`` limited to the remaining budget (None means no limit of its own)."""
+        remaining = self.remaining()
+        return remaining if seconds is None else min(seconds, remaining)
+
+
+def current() -> Optional[Deadline]:
+    return _current.get()
+
+
+@contextlib.contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """Run the body under a deadline ``seconds`` from now; an enclosing, earlier deadline wins."""
+    if seconds is None:
+        yield current()
+        return
+    deadline = Deadline(seconds)
+    outer = current()
+    if outer is not None and outer.at < deadline.at:
+        deadline = outer
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
@@ -0,0 +1,182 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Optional
+
+# Priority classes, most urgent first
+RISK_EXIT, MODIFY, PLACE, READ = range(4)
+CLASS_NAMES = {RISK_EXIT: "risk_exit", MODIFY: "modify", PLACE: "place", READ: "read"}
+
+# Endpoint path suffix -> priority class; anything unlisted is a read
+PATH_CLASSES = {
+    "/orders/positions/sqroff": RISK_EXIT,
+    "/orders/exit/sno": RISK_EXIT,
+    "/orders/cancel": RISK_EXIT,
+    "/orders/gtt/cancel": RISK_EXIT,
+    "/orders/modify": MODIFY,
+    "/orders/gtt/modify": MODIFY,
+    "/conversion": MODIFY,
+    "/orders/placeorder": PLACE,
+    "/orders/gtt/execute": PLACE,
+}
+
+
+def classify(url: str) -> int:
+    path = url.split("?", 1)[0]
+    for suffix, priority in PATH_CLASSES.items():
+        if path.endswith(suffix):
+            return priority
+    return READ
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class _Job:
+    __slots__ = ("fn", "future", "priority", "enqueued")
+
+    def __init__(self, fn: Callable, priority: int):
+        self.fn = fn
+        self.future = Future()
+        self.priority = priority
+        self.enqueued = time.monotonic()
+
+
+class ClassMetrics:
+    def __init__(self, window: int = 1000):
+        self.completed = 0
+        self.rejected = 0
+        self.promoted = 0
+        self.expired = 0
+        self.queue_waits = deque(maxlen=window)
+        self.latencies = deque(maxlen=window)
+
+    @staticmethod
+    def _summary(samples) -> dict:
+        if not samples:
+            return {"avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(samples)
+        pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+        return {
+            "avg_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+            "p50_ms": round(pick(0.50) * 1000, 2),
+            "p95_ms": round(pick(0.95) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+        }
+
+    def snapshot(self, queued: int) -> dict:
+        return {
+            "queued": queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "promoted": self.promoted,
+            "expired": self.expired,
+            "queue_wait": self._summary(list(self.queue_waits)),
+            "latency": self._summary(list(self.latencies)),
+        }
+
+
+class PriorityDispatcher:
+    """Runs broker calls on a fixed worker pool in priority order.
+
+    Workers always take the most urgent class first, except that a job which
+    has waited longer than ``starvation_after`` seconds is taken before
+    anything else so reads cannot be starved indefinitely by order traffic.
+    Each class has a bounded queue; submitting to a full queue waits up to
+    ``put_timeout`` seconds and then raises ``QueueFullError``.
+    """
+
+    def __init__(self, workers: int = 4, max_queue: int = 256, starvation_after: float = 2.0,
+                 put_timeout: float = 5.0):
+        self.max_queue = max_queue
+        self.starvation_after = starvation_after
+        self.put_timeout = put_timeout
+        self._queues: Dict[int, deque] = {p: deque() for p in CLASS_NAMES}
+        self._cond = threading.Condition()
+        self.metrics = {p: ClassMetrics() for p in CLASS_NAMES}
+        self._threads = [
+            threading.Thread(target=self._work, name=f"dispatch-{i}", daemon=True) for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, priority: int, fn: Callable, timeout: Optional[float] = None) -> Future:
+        job = _Job(fn, priority)
+        queue = self._queues[priority]
+        deadline = time.monotonic() + (self.put_timeout if timeout is None else timeout)
+        with self._cond:
+            while len(queue) >= self.max_queue:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.metrics[priority].rejected += 1
+                    raise QueueFullError(f"Dispatch queue full for {CLASS_NAMES[priority]} requests")
+                self._cond.wait(timeout=remaining)
+            queue.append(job)
+            self._cond.notify_all()
+        return job.future
+
+    def run(self, priority: int, fn: Callable, timeout: Optional[float] = None):
+        """Submit ``fn`` and block for its result, waiting in the queue at most ``timeout`` seconds.
+
+        A job still queued when the wait times out is cancelled so it never
+        reaches the broker, and ``concurrent.futures.TimeoutError`` is raised.
+        A job already running is waited for: ``fn`` is expected to bound
+        itself by the same deadline, and its own outcome is more precise.
+        """
+        if timeout is None:
+            return self.submit(priority, fn).result()
+        started = time.monotonic()
+        future = self.submit(priority, fn, timeout=min(self.put_timeout, timeout))
+        try:
+            return future.result(timeout=max(0.0, timeout - (time.monotonic() - started)))
+        except FutureTimeout:
+            if not future.cancel():
+                return future.result()
+            self.metrics[priority].expired += 1
+            raise
+
+    def _next_job(self) -> Optional[_Job]:
+        now = time.monotonic()
+        oldest = None
+        for queue in self._queues.values():
+            if queue and (oldest is None or queue[0].enqueued < oldest.enqueued):
+                oldest = queue[0]
+        if oldest is None:
+            return None
+        if now - oldest.enqueued >= self.starvation_after:
+            if any(self._queues[p] for p in CLASS_NAMES if p < oldest.priority):
+                self.metrics[oldest.priority].promoted += 1
+            return self._queues[oldest.priority].popleft()
+        for priority in sorted(self._queues):
+            if self._queues[priority]:
+                return self._queues[priority].popleft()
+        return None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    self._cond.wait()
+                    job = self._next_job()
+                # Wake producers blocked on a full queue
+                self._cond.notify_all()
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            started = time.monotonic()
+            try:
+                job.future.set_result(job.fn())
+            except BaseException as e:
+                job.future.set_exception(e)
+            finished = time.monotonic()
+            metrics = self.metrics[job.priority]
+            metrics.completed += 1
+            metrics.queue_waits.append(started - job.enqueued)
+            metrics.latencies.append(finished - job.enqueued)
+
+    def stats(self) -> dict:
+        with self._cond:
+            queued = {p: len(q) for p, q in self._queues.items()}
+        return {CLASS_NAMES[p]: self.metrics[p].snapshot(queued[p]) for p in CLASS_NAMES}
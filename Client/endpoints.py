@@ -0,0 +1,243 @@
+"""Declarative registry of broker endpoints.
+
+Each ``Endpoint`` states its HTTP method and path, the payload it sends, its
+read/write class, cache and batch behaviour and the MCP tool it backs. Both
+the ``AliceBlue`` methods and the ``@mcp.tool()`` wrappers in
+``Server/tools.py`` are generated from ``ENDPOINTS``.
+"""
+import inspect
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from .dispatcher import MODIFY, PLACE, READ, RISK_EXIT
+from .models import GttOrder, Holding, Order, Position, Trade
+
+REQUIRED = inspect.Parameter.empty
+
+# Payload value transforms
+UPPER = "upper"                    # str.upper() the value
+BLANK_IF_FALSY = "blank_if_falsy"  # send "" for None/0/""
+BLANK_IF_NONE = "blank_if_none"    # send "" for None
+OMIT_IF_NONE = "omit_if_none"      # leave the key out for None
+
+
+class Param:
+    __slots__ = ("name", "annotation", "default", "field", "transform")
+
+    def __init__(self, name: str, annotation=str, default=REQUIRED, field: Optional[str] = None,
+                 transform: Optional[str] = None):
+        self.name = name
+        self.annotation = annotation
+        self.default = default
+        self.field = field or name
+        self.transform = transform
+
+    def encode(self, payload: dict, value) -> None:
+        if self.transform == UPPER:
+            value = value.upper() if isinstance(value, str) else value
+        elif self.transform == BLANK_IF_FALSY:
+            value = value if value else ""
+        elif self.transform == BLANK_IF_NONE:
+            value = value if value is not None else ""
+        elif self.transform == OMIT_IF_NONE and value is None:
+            return
+        payload[self.field] = value
+
+    def signature(self) -> inspect.Parameter:
+        return inspect.Parameter(self.name, inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                                 default=self.default, annotation=self.annotation)
+
+
+class Endpoint:
+    """One broker API call.
+
+    ``body`` is None for GET, "object" for a JSON object or "list" for the
+    broker's one-element-array form (which also makes the call batchable:
+    several payloads can share one request). ``cache`` names the
+    ``READ_CACHE_TTL`` entry for cacheable reads; writes invalidate every
+    cached read. ``conditional`` marks large books fetched with conditional
+    requests (see ``ConditionalFetcher``). ``tool`` is the MCP tool name
+    (None for no tool) and ``tool_params`` limits which parameters the tool
+    exposes.
+    """
+
+    __slots__ = ("name", "method", "path", "label", "params", "body", "write", "cache", "conditional", "model",
+                 "priority", "detailed_errors", "doc", "tool", "tool_doc", "tool_params", "_signature")
+
+    def __init__(self, name: str, method: str, path: str, label: str, params: Sequence[Param] = (),
+                 body: Optional[str] = None, write: bool = False, cache: Optional[str] = None,
+                 conditional: bool = False, model=None,
+                 priority: int = READ, detailed_errors: bool = False, doc: str = "",
+                 tool: Optional[str] = None, tool_doc: Optional[str] = None,
+                 tool_params: Optional[Sequence[str]] = None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.label = label
+        self.params: Tuple[Param, ...] = tuple(params)
+        self.body = body
+        self.write = write
+        self.cache = cache
+        self.conditional = conditional
+        self.model = model
+        self.priority = priority
+        self.detailed_errors = detailed_errors
+        self.doc = doc
+        self.tool = tool
+        self.tool_doc = tool_doc or doc
+        self.tool_params = tuple(tool_params) if tool_params is not None else None
+        self._signature = inspect.Signature([p.signature() for p in self.params])
+
+    @property
+    def batchable(self) -> bool:
+        return self.body == "list"
+
+    @property
+    def signature(self) -> inspect.Signature:
+        return self._signature
+
+    def tool_signature(self) -> inspect.Signature:
+        params = self.params
+        if self.tool_params is not None:
+            params = [p for p in params if p.name in self.tool_params]
+        return inspect.Signature([p.signature() for p in params], return_annotation=dict)
+
+    def item(self, values: Dict[str, object]) -> dict:
+        item = {}
+        for param in self.params:
+            param.encode(item, values[param.name])
+        return item
+
+    def payload(self, values: Dict[str, object]) -> Union[dict, list, None]:
+        if self.body is None:
+            return None
+        item = self.item(values)
+        return [item] if self.body == "list" else item
+
+
+def _params(*specs) -> Tuple[Param, ...]:
+    return tuple(spec if isinstance(spec, Param) else Param(*spec) for spec in specs)
+
+
+ENDPOINTS: Tuple[Endpoint, ...] = (
+    Endpoint("get_profile", "GET", "/open-api/od/v1/profile", "Profile Error", cache="profile",
+             doc="Fetches the user's profile details.", tool="get_profile"),
+    Endpoint("get_holdings", "GET", "/open-api/od/v1/holdings/CNC", "Holding Error", cache="holdings",
+             conditional=True, model=Holding, doc="Fetches the user's Holdings Stock", tool="get_holdings"),
+    Endpoint("get_positions", "GET", "/open-api/od/v1/positions", "Position Error", cache="positions",
+             model=Position, doc="Fetches the user's Positions", tool="get_positions"),
+    Endpoint("get_positions_sqroff", "POST", "/open-api/od/v1/orders/positions/sqroff",
+             "Position Square Off Error", body="object", write=True, priority=RISK_EXIT,
+             params=_params(("exch",), ("symbol",), ("qty",), ("product",), ("transaction_type",)),
+             doc="Position Square Off", tool="get_positions_sqroff"),
+    Endpoint("get_position_conversion", "POST", "/open-api/od/v1/conversion", "Position Conversion Error",
+             body="object", write=True, priority=MODIFY,
+             params=_params(("exchange",), ("validity",), ("prevProduct",), ("product",), ("quantity", int),
+                            ("tradingSymbol",), ("transactionType",), ("orderSource",)),
+             doc="Position conversion", tool="get_position_conversion"),
+    Endpoint("get_place_order", "POST", "/open-api/od/v1/orders/placeorder", "Order Place Error",
+             body="list", write=True, priority=PLACE,
+             params=_params(
+                 Param("instrument_id", field="instrumentId"),
+                 Param("exchange"),
+                 Param("transaction_type", field="transactionType", transform=UPPER),
+                 Param("quantity", int),
+                 Param("order_type", field="orderType", transform=UPPER),
+                 Param("product", transform=UPPER),
+                 Param("order_complexity", field="orderComplexity", transform=UPPER),
+                 Param("price", float),
+                 Param("validity", transform=UPPER),
+                 Param("sl_leg_price", Optional[float], None, "slLegPrice", OMIT_IF_NONE),
+                 Param("target_leg_price", Optional[float], None, "targetLegPrice", OMIT_IF_NONE),
+                 Param("sl_trigger_price", Optional[float], None, "slTriggerPrice", OMIT_IF_NONE),
+                 Param("trailing_sl_amount", Optional[float], None, "trailingSlAmount", OMIT_IF_NONE),
+                 Param("disclosed_quantity", int, 0, "disclosedQuantity"),
+                 Param("source", str, "API", transform=UPPER),
+             ),
+             doc="Place an order with Alice Blue API.", tool="place_order",
+             tool_doc="Places an order for the given stock.",
+             tool_params=("instrument_id", "exchange", "transaction_type", "quantity", "order_type", "product",
+                          "order_complexity", "price", "validity")),
+    Endpoint("get_order_book", "GET", "/open-api/od/v1/orders/book", "Order Book Error", cache="order_book",
+             conditional=True, model=Order, doc="Fetches Order Book", tool="get_order_book"),
+    Endpoint("get_order_history", "POST", "/open-api/od/v1/orders/history", "Order History Error",
+             body="object", params=_params(("brokerOrderId",)),
+             doc="Fetchs Orders History", tool="get_order_history"),
+    Endpoint("get_modify_order", "POST", "/open-api/od/v1/orders/modify", "Order Modify Error",
+             body="list", write=True, priority=MODIFY,
+             params=_params(
+                 Param("brokerOrderId"),
+                 Param("validity", transform=UPPER),
+                 Param("quantity", Optional[int], None, transform=BLANK_IF_FALSY),
+                 Param("price", Optional[Union[int, float]], None, transform=BLANK_IF_FALSY),
+                 Param("triggerPrice", Optional[float], None, transform=BLANK_IF_FALSY),
+             ),
+             doc="Modify Order", tool="get_modify_order"),
+    Endpoint("get_cancel_order", "POST", "/open-api/od/v1/orders/cancel", "Order Cancel Error",
+             body="object", write=True, priority=RISK_EXIT, params=_params(("brokerOrderId",)),
+             doc="Cancel Order", tool="get_cancel_order"),
+    Endpoint("get_trade_book", "GET", "/open-api/od/v1/orders/trades", "Trade Book Error", cache="trade_book",
+             conditional=True, model=Trade, doc="Fetches Trade Book", tool="get_trade_book"),
+    Endpoint("get_order_margin", "POST", "/open-api/od/v1/orders/checkMargin", "Order Margin Error",
+             body="list",
+             params=_params(
+                 Param("exchange", transform=UPPER),
+                 Param("instrumentId", transform=UPPER),
+                 Param("transactionType", transform=UPPER),
+                 Param("quantity", int),
+                 Param("product", transform=UPPER),
+                 Param("orderComplexity", transform=UPPER),
+                 Param("orderType", transform=UPPER),
+                 Param("validity", transform=UPPER),
+                 Param("price", float, 0.0),
+                 Param("slTriggerPrice", Optional[Union[int, float]], None, transform=BLANK_IF_NONE),
+             ),
+             doc="Order Margin", tool="get_order_margin"),
+    Endpoint("get_exit_bracket_order", "POST", "/open-api/od/v1/orders/exit/sno", "Exit Bracket Order Error",
+             body="list", write=True, priority=RISK_EXIT,
+             params=_params(("brokerOrderId",), Param("orderComplexity", transform=UPPER)),
+             doc="Exit Bracket Order", tool="get_exit_bracket_order"),
+    Endpoint("get_place_gtt_order", "POST", "/open-api/od/v1/orders/gtt/execute", "GTT Order Place Error",
+             body="object", write=True, priority=PLACE, detailed_errors=True,
+             params=_params(
+                 Param("tradingSymbol", transform=UPPER),
+                 Param("exchange", transform=UPPER),
+                 Param("transactionType", transform=UPPER),
+                 Param("orderType", transform=UPPER),
+                 Param("product", transform=UPPER),
+                 Param("validity", transform=UPPER),
+                 Param("quantity", int),
+                 Param("price", float),
+                 Param("orderComplexity", transform=UPPER),
+                 Param("instrumentId"),
+                 Param("gttType", transform=UPPER),
+                 Param("gttValue", float),
+             ),
+             doc="Place GTT Order", tool="get_place_gtt_order"),
+    Endpoint("get_gtt_order_book", "GET", "/open-api/od/v1/orders/gtt/orderbook", "GTT Order Book Error",
+             cache="gtt_order_book", conditional=True, model=GttOrder, doc="Fetches GTT Order Book",
+             tool="get_gtt_order_book"),
+    Endpoint("get_modify_gtt_order", "POST", "/open-api/od/v1/orders/gtt/modify", "GTT Modify Order Error",
+             body="object", write=True, priority=MODIFY, detailed_errors=True,
+             params=_params(
+                 Param("brokerOrderId"),
+                 Param("instrumentId"),
+                 Param("tradingSymbol", transform=UPPER),
+                 Param("exchange", transform=UPPER),
+                 Param("orderType", transform=UPPER),
+                 Param("product", transform=UPPER),
+                 Param("validity", transform=UPPER),
+                 Param("quantity", int),
+                 Param("price", float),
+                 Param("orderComplexity", transform=UPPER),
+                 Param("gttType", transform=UPPER),
+                 Param("gttValue", float),
+             ),
+             doc="Modify GTT Order", tool="get_modify_gtt_order"),
+    Endpoint("get_cancel_gtt_order", "POST", "/open-api/od/v1/orders/gtt/cancel", "GTT Cancel Order Error",
+             body="object", write=True, priority=RISK_EXIT, params=_params(("brokerOrderId",)),
+             doc="Cancel GTT Order", tool="get_cancel_gtt_order"),
+    Endpoint("get_limits", "GET", "/open-api/od/v1/limits", "Limits Error", cache="limits",
+             doc="Get Limits", tool="get_limits"),
+)
+
+ENDPOINTS_BY_NAME: Dict[str, Endpoint] = {endpoint.name: endpoint for endpoint in ENDPOINTS}
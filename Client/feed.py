@@ -0,0 +1,255 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+try:
+    import websocket
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    websocket = None
+    WEBSOCKET_AVAILABLE = False
+
+# Wire field -> Quote field
+FEED_FIELDS = {
+    "lp": "ltp", "o": "open", "h": "high", "l": "low", "c": "close", "v": "volume",
+    "bp1": "bid", "sp1": "ask", "bq1": "bid_qty", "sq1": "ask_qty", "pc": "change_pct", "ft": "feed_time",
+}
+# Message types carrying quotes: "tk"/"dk" acknowledge a subscription with a full
+# snapshot, "tf"/"df" carry only the fields that changed
+QUOTE_MESSAGES = {"tk", "tf", "dk", "df"}
+
+
+class Quote(NamedTuple):
+    exchange: str
+    instrument_id: str
+    ltp: Optional[float] = None
+    open: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    close: Optional[float] = None
+    volume: Optional[float] = None
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+    bid_qty: Optional[float] = None
+    ask_qty: Optional[float] = None
+    change_pct: Optional[float] = None
+    feed_time: Optional[float] = None
+    received_at: float = 0.0
+
+
+def instrument_key(instrument: str, exchange: Optional[str] = None) -> str:
+    """Normalise ``"NSE|2885"`` or ``("2885", "NSE")`` to the feed key ``NSE|2885``."""
+    if "|" in instrument:
+        exchange, instrument = instrument.split("|", 1)
+    return f"{(exchange or 'NSE').upper()}|{instrument}"
+
+
+def decode(message) -> Optional[tuple]:
+    """Decode one feed frame into ``(type, key, changed_fields)``; None for non-quote frames."""
+    data = json.loads(message) if isinstance(message, (str, bytes)) else message
+    kind = data.get("t")
+    if kind not in QUOTE_MESSAGES or "tk" not in data:
+        return None
+    fields = {}
+    for wire, name in FEED_FIELDS.items():
+        value = data.get(wire)
+        if value is None:
+            continue
+        try:
+            fields[name] = float(value)
+        except (TypeError, ValueError):
+            continue
+    return kind, f"{data.get('e', 'NSE')}|{data['tk']}", fields
+
+
+class QuoteStore:
+    """Latest quote per instrument, readable without locks.
+
+    Only the feed thread writes. Each update builds a new immutable ``Quote``
+    and rebinds a single dict slot, which readers observe atomically.
+    """
+
+    def __init__(self):
+        self._quotes: Dict[str, Quote] = {}
+        self._listeners: List[Callable[[Quote], None]] = []
+        self.updates = 0
+
+    def add_listener(self, callback: Callable[[Quote], None]) -> None:
+        self._listeners = self._listeners + [callback]
+
+    def remove_listener(self, callback: Callable[[Quote], None]) -> None:
+        self._listeners = [c for c in self._listeners if c is not callback]
+
+    def apply(self, key: str, fields: dict, snapshot: bool = False) -> Quote:
+        previous = self._quotes.get(key)
+        if previous is None or snapshot:
+            exchange, instrument_id = key.split("|", 1)
+            quote = Quote(exchange, instrument_id, received_at=time.time(), **fields)
+        else:
+            quote = previous._replace(received_at=time.time(), **fields)
+        self._quotes[key] = quote
+        self.updates += 1
+        for callback in self._listeners:
+            try:
+                callback(quote)
+            except Exception as e:
+                print(f"Quote listener error: {e}")
+        return quote
+
+    def get(self, key: str) -> Optional[Quote]:
+        return self._quotes.get(key)
+
+    def ltp(self, key: str) -> Optional[float]:
+        quote = self._quotes.get(key)
+        return quote.ltp if quote else None
+
+    def discard(self, key: str) -> None:
+        self._quotes.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+
+class FeedClient:
+    """Streaming market-data client that keeps a ``QuoteStore`` current.
+
+    Subscriptions survive reconnects: after every (re)connect the client
+    authenticates and re-subscribes everything. ``connect`` can be replaced
+    with a factory returning any object with ``send``/``recv``/``close`` (for
+    example a connection to a local fake feed).
+    """
+
+    def __init__(self, url: str, user_id: str, session: str, store: Optional[QuoteStore] = None,
+                 connect: Optional[Callable] = None, heartbeat: float = 30.0, max_backoff: float = 30.0):
+        self.url = url
+        self.user_id = user_id
+        self.session = session
+        self.store = store or QuoteStore()
+        self.heartbeat = heartbeat
+        self.max_backoff = max_backoff
+        self._connect_fn = connect or self._default_connect
+        self._subscriptions = set()
+        self._sub_lock = threading.Lock()
+        self._ws = None
+        self._send_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._connected = threading.Event()
+        self._thread = None
+        self.reconnects = 0
+        self.last_error = None
+
+    def _default_connect(self, url: str):
+        if not WEBSOCKET_AVAILABLE:
+            raise Exception("websocket-client is not installed - run: pip install websocket-client")
+        return websocket.create_connection(url, timeout=self.heartbeat)
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def start(self) -> "FeedClient":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="market-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+
+    def wait_connected(self, timeout: float) -> bool:
+        return self._connected.wait(timeout)
+
+    def _send(self, message: dict) -> None:
+        ws = self._ws
+        if ws is None:
+            return
+        with self._send_lock:
+            ws.send(json.dumps(message, separators=(",", ":")))
+
+    def _auth_message(self) -> dict:
+        token = hashlib.sha256(hashlib.sha256(self.session.encode()).hexdigest().encode()).hexdigest()
+        user = f"{self.user_id}_API"
+        return {"t": "c", "susertoken": token, "actid": user, "uid": user, "source": "API"}
+
+    def subscribe(self, keys: Iterable[str]) -> None:
+        with self._sub_lock:
+            new = [k for k in keys if k not in self._subscriptions]
+            self._subscriptions.update(new)
+        if new and self.connected:
+            self._send({"t": "t", "k": "#".join(new)})
+
+    def unsubscribe(self, keys: Iterable[str]) -> None:
+        with self._sub_lock:
+            gone = [k for k in keys if k in self._subscriptions]
+            self._subscriptions.difference_update(gone)
+        if not gone:
+            return
+        if self.connected:
+            self._send({"t": "u", "k": "#".join(gone)})
+        for key in gone:
+            self.store.discard(key)
+
+    @property
+    def subscriptions(self) -> List[str]:
+        with self._sub_lock:
+            return sorted(self._subscriptions)
+
+    def _run(self) -> None:
+        backoff = 0.5
+        while not self._stop.is_set():
+            try:
+                self._ws = self._connect_fn(self.url)
+                self._send(self._auth_message())
+                self._connected.set()
+                keys = self.subscriptions
+                if keys:
+                    self._send({"t": "t", "k": "#".join(keys)})
+                backoff = 0.5
+                self._read_loop()
+            except Exception as e:
+                self.last_error = str(e)
+            finally:
+                self._connected.clear()
+                ws, self._ws = self._ws, None
+                if ws is not None:
+                    try:
+                        ws.close()
+                    except Exception:
+                        pass
+            if self._stop.is_set():
+                break
+            self.reconnects += 1
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def _read_loop(self) -> None:
+        store = self.store
+        last_sent = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                message = self._ws.recv()
+            except Exception as e:
+                # A read timeout on an idle feed only means it is time for a heartbeat
+                if WEBSOCKET_AVAILABLE and isinstance(e, websocket.WebSocketTimeoutException):
+                    message = None
+                else:
+                    raise
+            if message is not None:
+                if not message:
+                    raise ConnectionError("Feed connection closed")
+                decoded = decode(message)
+                if decoded is not None:
+                    kind, key, fields = decoded
+                    store.apply(key, fields, snapshot=kind in ("tk", "dk"))
+            if time.monotonic() - last_sent >= self.heartbeat:
+                self._send({"t": "h"})
+                last_sent = time.monotonic()
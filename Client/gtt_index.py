@@ -0,0 +1,273 @@
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .deadline import DeadlineExceeded, current as current_deadline
+from .utils import extract_rows
+
+# Fields the broker requires on every GTT modify; missing ones are filled from the index
+GTT_MODIFY_FIELDS = ("instrumentId", "tradingSymbol", "exchange", "orderType", "product", "validity",
+                     "quantity", "price", "orderComplexity", "gttType", "gttValue")
+
+GTT_PLACE_FIELDS = ("tradingSymbol", "exchange", "transactionType", "orderType", "product", "validity",
+                    "quantity", "price", "orderComplexity", "instrumentId", "gttType", "gttValue")
+
+
+def _gtt_key(row: dict) -> Optional[Tuple[str, float]]:
+    instrument = row.get("instrumentId") or row.get("token")
+    value = row.get("gttValue")
+    try:
+        return str(instrument), float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _result_order_id(response) -> Optional[str]:
+    for row in extract_rows(response):
+        if isinstance(row, dict) and row.get("brokerOrderId"):
+            return str(row["brokerOrderId"])
+    if isinstance(response, dict) and response.get("brokerOrderId"):
+        return str(response["brokerOrderId"])
+    return None
+
+
+def _confirms(book_row: Optional[dict], change: Optional[dict]) -> bool:
+    """True once the book shows a pending change: the order gone for a cancel, its fields for the rest."""
+    if change is None:
+        return book_row is None
+    if book_row is None:
+        return False
+    return all(_same_value(book_row[k], v) for k, v in change.items() if k in book_row)
+
+
+def _same_value(a, b) -> bool:
+    """Book and request spell values differently: "99.50" vs 99.5, "limit" vs "LIMIT"."""
+    try:
+        return float(a) == float(b)
+    except (TypeError, ValueError):
+        return str(a).strip().upper() == str(b).strip().upper()
+
+
+def _out_of_time() -> bool:
+    deadline = current_deadline()
+    return deadline is not None and deadline.expired
+
+
+SKIPPED = {"status": "skipped", "message": "Deadline exceeded before this order was sent"}
+
+
+def _timed_out(e: DeadlineExceeded) -> dict:
+    return {"status": "timeout", "stage": e.stage, "message": str(e)}
+
+
+class GttIndex:
+    """Local index of GTT orders sorted by ``gttValue`` per instrument.
+
+    Each instrument keeps a sorted list of ``(gttValue, brokerOrderId)`` so
+    range queries are a pair of bisects. ``refresh`` diffs the broker's GTT
+    order book against the index and only touches rows that changed. Bulk
+    operations stop sending once the caller's deadline passes and report the
+    unsent items as skipped. Changes the book may not show yet (replayed from
+    the order journal after a restart) stay pending: every refresh re-applies
+    them until the book confirms them or ``pending_ttl`` seconds pass.
+    """
+
+    def __init__(self, client, max_age: float = 5.0, pending_ttl: float = 60.0,
+                 on_refresh: Optional[Callable[[float], None]] = None):
+        """``on_refresh`` gets the wall time each successful refresh's book request started."""
+        self.client = client
+        self.max_age = max_age
+        self.pending_ttl = pending_ttl
+        self.on_refresh = on_refresh
+        self._pending: Dict[str, Tuple[float, Optional[dict]]] = {}
+        self._rows: Dict[str, dict] = {}
+        self._keys: Dict[str, Tuple[str, float]] = {}
+        self._by_instrument: Dict[str, List[Tuple[float, str]]] = {}
+        self._lock = threading.RLock()
+        self.refreshed_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _insert(self, order_id: str, row: dict) -> None:
+        self._rows[order_id] = row
+        key = _gtt_key(row)
+        if key is None:
+            return
+        self._keys[order_id] = key
+        instrument, value = key
+        bisect.insort(self._by_instrument.setdefault(instrument, []), (value, order_id))
+
+    def _remove(self, order_id: str) -> None:
+        self._rows.pop(order_id, None)
+        key = self._keys.pop(order_id, None)
+        if key is None:
+            return
+        instrument, value = key
+        entries = self._by_instrument.get(instrument)
+        if not entries:
+            return
+        pos = bisect.bisect_left(entries, (value, order_id))
+        if pos < len(entries) and entries[pos] == (value, order_id):
+            del entries[pos]
+        if not entries:
+            del self._by_instrument[instrument]
+
+    def upsert(self, order_id: str, row: dict) -> None:
+        with self._lock:
+            if _gtt_key(row) != self._keys.get(order_id):
+                self._remove(order_id)
+                self._insert(order_id, row)
+            else:
+                self._rows[order_id] = row
+
+    def discard(self, order_id: str) -> None:
+        with self._lock:
+            self._remove(order_id)
+
+    def add_pending(self, order_id: str, change: Optional[dict]) -> None:
+        """Apply a change the broker book may not show yet; ``change`` None means cancelled."""
+        order_id = str(order_id)
+        with self._lock:
+            self._pending[order_id] = (time.monotonic() + self.pending_ttl, change)
+            self._apply_pending(order_id, change, self._rows.get(order_id))
+
+    def _apply_pending(self, order_id: str, change: Optional[dict], base: Optional[dict]) -> None:
+        if change is None:
+            self._remove(order_id)
+        else:
+            self.upsert(order_id, dict(base or {}, **change))
+
+    def refresh(self) -> dict:
+        """Sync the index with the GTT order book, touching only changed rows."""
+        started = time.time()
+        book = self.client.get_gtt_order_book()
+        added = updated = removed = 0
+        with self._lock:
+            rows = {}
+            for row in extract_rows(book):
+                order_id = row.get("brokerOrderId")
+                if not order_id:
+                    continue
+                order_id = str(order_id)
+                rows[order_id] = row
+                current = self._rows.get(order_id)
+                if current is None:
+                    self._insert(order_id, row)
+                    added += 1
+                elif current != row:
+                    self.upsert(order_id, row)
+                    updated += 1
+            for order_id in [o for o in self._rows if o not in rows and o not in self._pending]:
+                self._remove(order_id)
+                removed += 1
+            now = time.monotonic()
+            for order_id, (expires, change) in list(self._pending.items()):
+                if _confirms(rows.get(order_id), change) or now > expires:
+                    # The book wins from here on
+                    del self._pending[order_id]
+                    if order_id not in rows and order_id in self._rows:
+                        self._remove(order_id)
+                        removed += 1
+                else:
+                    self._apply_pending(order_id, change, rows.get(order_id))
+            self.refreshed_at = now
+        if self.on_refresh is not None:
+            self.on_refresh(started)
+        return {"added": added, "updated": updated, "removed": removed, "pending": len(self._pending),
+                "total": len(self._rows)}
+
+    def ensure_fresh(self) -> None:
+        if time.monotonic() - self.refreshed_at > self.max_age:
+            self.refresh()
+
+    def get(self, order_id: str) -> Optional[dict]:
+        return self._rows.get(str(order_id))
+
+    def in_range(self, instrument_id: str, low: Optional[float] = None, high: Optional[float] = None) -> List[dict]:
+        """GTT rows for an instrument with ``low <= gttValue <= high``."""
+        with self._lock:
+            entries = self._by_instrument.get(str(instrument_id), [])
+            start = 0 if low is None else bisect.bisect_left(entries, (low, ""))
+            end = len(entries) if high is None else bisect.bisect_right(entries, (high, "\uffff"))
+            return [self._rows[order_id] for _, order_id in entries[start:end]]
+
+    def near(self, instrument_id: str, price: float, percent: float = 1.0) -> List[dict]:
+        """GTT rows whose trigger lies within ``percent`` of ``price``."""
+        band = abs(price) * percent / 100.0
+        return self.in_range(instrument_id, price - band, price + band)
+
+    def bulk_place(self, orders: Iterable[dict]) -> List[dict]:
+        results = []
+        for order in orders:
+            if _out_of_time():
+                results.append(dict(SKIPPED, order=order))
+                continue
+            try:
+                params = {field: order[field] for field in GTT_PLACE_FIELDS}
+                response = self.client.get_place_gtt_order(**params)
+                order_id = _result_order_id(response)
+                if order_id:
+                    self.upsert(order_id, dict(params, brokerOrderId=order_id))
+                results.append({"status": "success", "brokerOrderId": order_id, "data": response})
+            except KeyError as e:
+                results.append({"status": "error", "message": f"Missing field {e}", "order": order})
+            except DeadlineExceeded as e:
+                results.append(dict(_timed_out(e), order=order))
+            except Exception as e:
+                results.append({"status": "error", "message": str(e), "order": order})
+        return results
+
+    def bulk_modify(self, modifications: Iterable[dict]) -> List[dict]:
+        """Modify GTTs; fields not given are taken from the indexed row."""
+        self.ensure_fresh()
+        results = []
+        for change in modifications:
+            order_id = str(change.get("brokerOrderId", ""))
+            if _out_of_time():
+                results.append(dict(SKIPPED, brokerOrderId=order_id))
+                continue
+            current = self.get(order_id)
+            if current is None:
+                results.append({"status": "error", "brokerOrderId": order_id, "message": "GTT order not found"})
+                continue
+            params = {field: change.get(field, current.get(field)) for field in GTT_MODIFY_FIELDS}
+            missing = [field for field, value in params.items() if value is None]
+            if missing:
+                results.append({"status": "error", "brokerOrderId": order_id,
+                                "message": f"Missing fields: {', '.join(missing)}"})
+                continue
+            try:
+                response = self.client.get_modify_gtt_order(brokerOrderId=order_id, **params)
+                self.upsert(order_id, dict(current, **params))
+                results.append({"status": "success", "brokerOrderId": order_id, "data": response})
+            except DeadlineExceeded as e:
+                results.append(dict(_timed_out(e), brokerOrderId=order_id))
+            except Exception as e:
+                results.append({"status": "error", "brokerOrderId": order_id, "message": str(e)})
+        return results
+
+    def bulk_cancel(self, order_ids: Optional[Iterable[str]] = None, instrument_id: Optional[str] = None,
+                    low: Optional[float] = None, high: Optional[float] = None) -> List[dict]:
+        """Cancel the given GTTs, or every GTT of an instrument within a trigger range."""
+        if order_ids is None:
+            if instrument_id is None:
+                raise ValueError("Pass brokerOrderIds or an instrumentId to select GTT orders")
+            self.ensure_fresh()
+            order_ids = [row["brokerOrderId"] for row in self.in_range(instrument_id, low, high)]
+        results = []
+        for order_id in order_ids:
+            order_id = str(order_id)
+            if _out_of_time():
+                results.append(dict(SKIPPED, brokerOrderId=order_id))
+                continue
+            try:
+                response = self.client.get_cancel_gtt_order(order_id)
+                self.discard(order_id)
+                results.append({"status": "success", "brokerOrderId": order_id, "data": response})
+            except DeadlineExceeded as e:
+                results.append(dict(_timed_out(e), brokerOrderId=order_id))
+            except Exception as e:
+                results.append({"status": "error", "brokerOrderId": order_id, "message": str(e)})
+        return results
@@ -0,0 +1,384 @@
+import glob
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .transport import redact
+from .utils import extract_rows
+
+SEGMENT_PATTERN = "orders-*.jsonl"
+GTT_OPS = ("get_place_gtt_order", "get_modify_gtt_order", "get_cancel_gtt_order")
+
+# Wall time of the last GTT book refresh; recovery only replays entries after it
+GTT_REFRESH_MARK = "gtt-refreshed"
+# Calls still in flight when that book was read may not show in it
+RECOVERY_MARGIN = 60.0
+# Without a mark, replay at most this far back; older changes are in the broker's book anyway
+RECOVERY_WINDOW = 3600.0
+
+# Cheap pre-parse of the fields the index needs; every line starts with them
+_LINE_HEAD = re.compile(rb'^\{"ts":([0-9.]+),"op":"([^"]*)","ids":\[([^\]]*)\]')
+
+
+def _order_ids(*values) -> List[str]:
+    """brokerOrderIds named in request payloads and response rows."""
+    ids = []
+    for value in values:
+        if value is None:
+            continue
+        rows = value if isinstance(value, list) else [value]
+        if isinstance(value, dict):
+            rows = rows + extract_rows(value)
+        for row in rows:
+            if isinstance(row, dict) and row.get("brokerOrderId"):
+                order_id = str(row["brokerOrderId"])
+                if order_id not in ids:
+                    ids.append(order_id)
+    return ids
+
+
+def _segment_number(path: str) -> int:
+    return int(os.path.basename(path)[len("orders-"):-len(".jsonl")])
+
+
+def list_segments(directory: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, SEGMENT_PATTERN)), key=_segment_number)
+
+
+class OrderJournal:
+    """Append-only journal of order requests, written behind the order path.
+
+    ``record`` only queues the entry. A background thread writes queued
+    entries as JSONL in batches, fsyncs at most every ``fsync_interval``
+    seconds and starts a new segment once the current one reaches
+    ``max_bytes``, keeping the newest ``max_segments``. A crash loses at
+    most the last interval of entries; each process start opens a fresh
+    segment, so a torn final line never gets appended to.
+    """
+
+    def __init__(self, directory: str, fsync_interval: float = 0.2, max_bytes: int = 64 << 20,
+                 max_segments: int = 20, max_queue: int = 100000):
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.max_segments = max_segments
+        self.max_queue = max_queue
+        os.makedirs(directory, exist_ok=True)
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._closing = False
+        self._sync_requested = False
+        self._file = None
+        self.path = None
+        self._taken = 0
+        self.written = 0
+        self.synced = 0
+        self.dropped = 0
+        self.batches = 0
+        self.fsyncs = 0
+        self.last_error = None
+        self._open_segment()
+        self._thread = threading.Thread(target=self._run, name="order-journal", daemon=True)
+        self._thread.start()
+
+    def record(self, op: str, request, response=None, error: Optional[str] = None,
+               latency_ms: Optional[float] = None, started: Optional[float] = None) -> None:
+        """Queue one order call; never blocks on disk."""
+        entry = (started or time.time(), op, request, response, error, latency_ms)
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                return
+            self._queue.append(entry)
+            if len(self._queue) == 1:
+                self._cond.notify_all()
+
+    @staticmethod
+    def encode(entry: tuple) -> str:
+        started, op, request, response, error, latency_ms = entry
+        line = {"ts": round(started, 6), "op": op, "ids": _order_ids(request, response), "ms": latency_ms,
+                "req": redact(request)}
+        if error is not None:
+            line["error"] = error
+        else:
+            line["res"] = redact(response)
+        return json.dumps(line, separators=(",", ":"), default=str) + "\n"
+
+    def _open_segment(self) -> None:
+        segments = list_segments(self.directory)
+        number = _segment_number(segments[-1]) + 1 if segments else 1
+        while True:
+            # Exclusive create: workers sharing the directory each get a segment of their own
+            self.path = os.path.join(self.directory, f"orders-{number:06d}.jsonl")
+            try:
+                self._file = open(self.path, "x", encoding="utf-8")
+                break
+            except FileExistsError:
+                number += 1
+        for old in segments[:max(0, len(segments) + 1 - self.max_segments)]:
+            for path in (old, old + ".idx"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _run(self) -> None:
+        last_fsync = time.monotonic()
+        dirty = False
+        while True:
+            with self._cond:
+                while not self._queue and not self._closing and not self._sync_requested:
+                    if not dirty:
+                        self._cond.wait()
+                        continue
+                    remaining = last_fsync + self.fsync_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(timeout=remaining)
+                batch = list(self._queue)
+                self._queue.clear()
+                self._taken += len(batch)
+                taken = self._taken
+                closing = self._closing
+                sync_now = closing or self._sync_requested
+                self._sync_requested = False
+            try:
+                if batch:
+                    self._file.write("".join(self.encode(entry) for entry in batch))
+                    self._file.flush()
+                    self.written += len(batch)
+                    self.batches += 1
+                    dirty = True
+                if dirty and (sync_now or time.monotonic() - last_fsync >= self.fsync_interval):
+                    os.fsync(self._file.fileno())
+                    self.fsyncs += 1
+                    last_fsync = time.monotonic()
+                    dirty = False
+                if not dirty:
+                    with self._cond:
+                        self.synced = taken
+                        self._cond.notify_all()
+                if self._file.tell() >= self.max_bytes:
+                    self._file.close()
+                    self._open_segment()
+            except Exception as e:
+                self.last_error = str(e)
+            if closing:
+                with self._cond:
+                    if self._queue:
+                        continue
+                self._file.close()
+                return
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Write and fsync everything queued so far; False if that took longer than ``timeout``."""
+        give_up = time.monotonic() + timeout
+        with self._cond:
+            target = self._taken + len(self._queue)
+            self._sync_requested = True
+            self._cond.notify_all()
+            while self.synced < target:
+                remaining = give_up - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(timeout=remaining)
+            return True
+
+    def close(self) -> None:
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout=5.0)
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "queued": len(self._queue),
+            "written": self.written,
+            "synced": self.synced,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "fsyncs": self.fsyncs,
+            "last_error": self.last_error,
+        }
+
+
+class JournalReader:
+    """Indexed reader over journal segments for post-trade analysis.
+
+    Each segment is indexed once by byte offset per brokerOrderId together
+    with its time range. Closed segments keep the index in a ``.idx``
+    sidecar file, so order lookups seek straight to their lines and time
+    queries skip whole segments.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._indexes: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _build_index(self, path: str, size: int, base: Optional[dict] = None) -> dict:
+        """Index ``path``; given ``base``, the index of a shorter version of it, only read what was appended."""
+        if base is None:
+            base = {"first_ts": None, "last_ts": None, "count": 0, "ids": {}, "end": 0}
+        ids = base["ids"]
+        # Sidecars written before "end" existed always cover the whole (closed) file
+        end = base.get("end", base.get("size", 0))
+        first, last, count = base["first_ts"], base["last_ts"], base["count"]
+        with open(path, "rb") as f:
+            f.seek(end)
+            for line in f:
+                # A line still being written is indexed on a later call, once complete
+                if not line.endswith(b"\n"):
+                    break
+                match = _LINE_HEAD.match(line)
+                if match:
+                    ts = float(match.group(1))
+                    first = ts if first is None else first
+                    last = ts
+                    count += 1
+                    for order_id in re.findall(rb'"([^"]*)"', match.group(3)):
+                        ids.setdefault(order_id.decode(), []).append(end)
+                end += len(line)
+        return {"size": size, "end": end, "first_ts": first, "last_ts": last, "count": count, "ids": ids}
+
+    def index(self, path: str, closed: bool) -> dict:
+        size = os.path.getsize(path)
+        with self._lock:
+            cached = self._indexes.get(path)
+            if cached is not None and cached["size"] == size:
+                return cached
+            sidecar = path + ".idx"
+            index = None
+            if closed and os.path.exists(sidecar):
+                with open(sidecar, encoding="utf-8") as f:
+                    index = json.load(f)
+                if index.get("size") != size:
+                    index = None
+            if index is None:
+                # Segments only grow: extend the cached index of the live segment instead of rereading it
+                base = cached if cached is not None and cached.get("end", 0) <= size else None
+                index = self._build_index(path, size, base)
+                if closed:
+                    with open(sidecar, "w", encoding="utf-8") as f:
+                        json.dump(index, f, separators=(",", ":"))
+            self._indexes[path] = index
+            return index
+
+    def _indexed_segments(self, since: Optional[float] = None):
+        segments = list_segments(self.directory)
+        with self._lock:
+            # Rotation deletes old segments; forget their indexes too
+            for gone in set(self._indexes) - set(segments):
+                del self._indexes[gone]
+        for i, path in enumerate(segments):
+            # Last written before ``since``: nothing in it can be newer, so skip it without indexing
+            if since is not None and os.path.getmtime(path) < since:
+                continue
+            # The newest segment may still be written to
+            yield path, self.index(path, closed=i < len(segments) - 1)
+
+    def entries(self, since: Optional[float] = None, until: Optional[float] = None,
+                ops: Optional[Iterable[str]] = None) -> Iterator[dict]:
+        """Entries in write order, optionally limited to a time range and to some operations."""
+        ops = set(ops) if ops else None
+        for path, index in self._indexed_segments(since):
+            if not index["count"]:
+                continue
+            if since is not None and index["last_ts"] < since:
+                continue
+            if until is not None and index["first_ts"] > until:
+                break
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    match = _LINE_HEAD.match(line)
+                    if not match:
+                        continue
+                    ts = float(match.group(1))
+                    if (since is not None and ts < since) or (until is not None and ts > until):
+                        continue
+                    if ops is not None and match.group(2).decode() not in ops:
+                        continue
+                    yield json.loads(line)
+
+    def for_order(self, order_id: str) -> List[dict]:
+        """Every journaled call that named ``order_id``, oldest first."""
+        order_id = str(order_id)
+        found = []
+        for path, index in self._indexed_segments():
+            offsets = index["ids"].get(order_id)
+            if not offsets:
+                continue
+            with open(path, "rb") as f:
+                for offset in offsets:
+                    f.seek(offset)
+                    found.append(json.loads(f.readline()))
+        return found
+
+    def summary(self, since: Optional[float] = None) -> dict:
+        """Calls, errors and latency percentiles per operation."""
+        per_op: Dict[str, dict] = {}
+        for entry in self.entries(since=since):
+            stats = per_op.setdefault(entry["op"], {"calls": 0, "errors": 0, "latencies": []})
+            stats["calls"] += 1
+            if "error" in entry:
+                stats["errors"] += 1
+            if entry.get("ms") is not None:
+                stats["latencies"].append(entry["ms"])
+        for stats in per_op.values():
+            samples = sorted(stats.pop("latencies"))
+            pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] if samples else None
+            stats.update(p50_ms=pick(0.50), p95_ms=pick(0.95), max_ms=samples[-1] if samples else None)
+        return per_op
+
+
+def mark_gtt_refresh(directory: str, at: float) -> None:
+    """Record that the GTT book was read in full at wall time ``at``."""
+    path = os.path.join(directory, GTT_REFRESH_MARK)
+    # Per-process temp file: workers sharing the directory may mark at the same time
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(repr(at))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def recovery_since(directory: str) -> float:
+    """Oldest journal time worth replaying into a fresh GttIndex."""
+    try:
+        with open(os.path.join(directory, GTT_REFRESH_MARK), encoding="utf-8") as f:
+            return float(f.read()) - RECOVERY_MARGIN
+    except (OSError, ValueError):
+        return time.time() - RECOVERY_WINDOW
+
+
+def restore_gtt_index(reader: JournalReader, index, since: Optional[float] = None) -> int:
+    """Re-apply journaled GTT place/modify/cancel calls to a GttIndex as pending changes.
+
+    Only entries after the last GTT book refresh are read (see ``recovery_since``);
+    the index keeps them on top of the book until the book confirms them.
+    Returns the entries applied.
+    """
+    if since is None:
+        since = recovery_since(reader.directory)
+    applied = 0
+    for entry in reader.entries(since=since, ops=GTT_OPS):
+        if "error" in entry or not entry["ids"]:
+            continue
+        order_id = entry["ids"][0]
+        if entry["op"] == "get_cancel_gtt_order":
+            index.add_pending(order_id, None)
+        else:
+            change = dict(entry.get("req") or {})
+            change["brokerOrderId"] = order_id
+            index.add_pending(order_id, change)
+        applied += 1
+    return applied
@@ -0,0 +1,244 @@
+import sys
+from array import array
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
+
+from .utils import extract_rows
+
+# Field kinds: "enum" strings are upper-cased and interned so every row shares one
+# object per distinct value; "str" is kept as-is; numbers are parsed once on load.
+STR, ENUM, FLOAT, INT = "str", "enum", "float", "int"
+
+
+def _to_float(value) -> float:
+    if value is None or value == "":
+        return float("nan")
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError:
+        return float("nan")
+
+
+def _to_int(value) -> int:
+    number = _to_float(value)
+    return 0 if number != number else int(number)
+
+
+def _to_enum(value) -> Optional[str]:
+    return sys.intern(str(value).upper()) if value not in (None, "") else None
+
+
+CONVERTERS = {STR: lambda v: None if v in (None, "") else str(v), ENUM: _to_enum, FLOAT: _to_float, INT: _to_int}
+
+
+class Model:
+    """Base for compact broker row models.
+
+    Subclasses declare ``FIELDS`` as ``(attribute, kind, broker keys...)``;
+    ``__slots__`` is derived from it, so instances carry no ``__dict__``.
+    """
+
+    __slots__ = ()
+    FIELDS: Sequence[tuple] = ()
+    _plan: tuple = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._plan = tuple((spec[0], CONVERTERS[spec[1]], spec[2:]) for spec in cls.FIELDS)
+
+    def __init__(self, **values):
+        for name, _, _ in self._plan:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_row(cls, row: dict) -> "Model":
+        obj = cls.__new__(cls)
+        for name, convert, keys in cls._plan:
+            value = None
+            for key in keys:
+                value = row.get(key)
+                if value is not None:
+                    break
+            setattr(obj, name, convert(value))
+        return obj
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name, _, _ in self._plan}
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        shown = ", ".join(f"{name}={getattr(self, name)!r}" for name, _, _ in self._plan[:4])
+        return f"{type(self).__name__}({shown}, ...)"
+
+
+def _model(name: str, fields: Sequence[tuple]) -> type:
+    return type(name, (Model,), {"__slots__": tuple(f[0] for f in fields), "FIELDS": tuple(fields)})
+
+
+Order = _model("Order", [
+    ("broker_order_id", STR, "brokerOrderId", "orderId"),
+    ("exchange_order_id", STR, "exchangeOrderId"),
+    ("trading_symbol", STR, "tradingSymbol", "formattedInstrumentName"),
+    ("instrument_id", STR, "instrumentId", "token"),
+    ("exchange", ENUM, "exchange"),
+    ("transaction_type", ENUM, "transactionType"),
+    ("order_type", ENUM, "orderType"),
+    ("product", ENUM, "product"),
+    ("order_complexity", ENUM, "orderComplexity"),
+    ("validity", ENUM, "validity"),
+    ("status", ENUM, "orderStatus", "status"),
+    ("quantity", INT, "quantity"),
+    ("filled_quantity", INT, "filledQuantity"),
+    ("pending_quantity", INT, "pendingQuantity"),
+    ("price", FLOAT, "price"),
+    ("trigger_price", FLOAT, "triggerPrice", "slTriggerPrice"),
+    ("average_price", FLOAT, "averageTradedPrice", "averagePrice"),
+    ("order_time", STR, "orderTime"),
+    ("rejection_reason", STR, "rejectionReason"),
+])
+
+Trade = _model("Trade", [
+    ("broker_order_id", STR, "brokerOrderId", "orderId"),
+    ("exchange_order_id", STR, "exchangeOrderId"),
+    ("trade_id", STR, "tradeId", "fillId"),
+    ("trading_symbol", STR, "tradingSymbol", "formattedInstrumentName"),
+    ("instrument_id", STR, "instrumentId", "token"),
+    ("exchange", ENUM, "exchange"),
+    ("transaction_type", ENUM, "transactionType"),
+    ("product", ENUM, "product"),
+    ("quantity", INT, "filledQuantity", "quantity"),
+    ("price", FLOAT, "tradedPrice", "averageTradedPrice", "price"),
+    ("fill_time", STR, "fillTime", "tradeTime"),
+])
+
+Position = _model("Position", [
+    ("trading_symbol", STR, "tradingSymbol", "formattedInstrumentName"),
+    ("instrument_id", STR, "instrumentId", "token"),
+    ("exchange", ENUM, "exchange"),
+    ("product", ENUM, "product"),
+    ("net_quantity", INT, "netQuantity", "netQty"),
+    ("buy_quantity", INT, "buyQuantity"),
+    ("sell_quantity", INT, "sellQuantity"),
+    ("net_average_price", FLOAT, "netAvgPrice", "netAveragePrice"),
+    ("buy_average_price", FLOAT, "buyAvgPrice"),
+    ("sell_average_price", FLOAT, "sellAvgPrice"),
+    ("ltp", FLOAT, "ltp"),
+    ("realized_pnl", FLOAT, "realizedPnl", "realisedPnl"),
+    ("unrealized_pnl", FLOAT, "unrealizedPnl", "unrealisedPnl"),
+])
+
+Holding = _model("Holding", [
+    ("trading_symbol", STR, "tradingSymbol", "formattedInstrumentName"),
+    ("instrument_id", STR, "instrumentId", "token"),
+    ("isin", STR, "isin"),
+    ("exchange", ENUM, "exchange"),
+    ("product", ENUM, "product"),
+    ("quantity", INT, "holdingQuantity", "quantity", "totalQuantity"),
+    ("average_price", FLOAT, "averagePrice", "avgPrice"),
+    ("ltp", FLOAT, "ltp"),
+    ("close_price", FLOAT, "closePrice"),
+])
+
+GttOrder = _model("GttOrder", [
+    ("broker_order_id", STR, "brokerOrderId"),
+    ("trading_symbol", STR, "tradingSymbol"),
+    ("instrument_id", STR, "instrumentId", "token"),
+    ("exchange", ENUM, "exchange"),
+    ("transaction_type", ENUM, "transactionType"),
+    ("order_type", ENUM, "orderType"),
+    ("product", ENUM, "product"),
+    ("gtt_type", ENUM, "gttType"),
+    ("status", ENUM, "orderStatus", "status"),
+    ("quantity", INT, "quantity"),
+    ("price", FLOAT, "price"),
+    ("gtt_value", FLOAT, "gttValue"),
+])
+
+
+class ModelTable:
+    """Column-oriented collection of one model type.
+
+    Numbers live in ``array`` columns (8 bytes per value) and enum columns
+    hold interned strings, so large books cost a fraction of the equivalent
+    dicts. Rows are materialised as model objects only when accessed.
+    """
+
+    __slots__ = ("model", "columns", "_length")
+
+    def __init__(self, model: type, rows: Iterable[dict] = ()):
+        self.model = model
+        self.columns = {}
+        for name, kind, *_ in model.FIELDS:
+            if kind == FLOAT:
+                self.columns[name] = array("d")
+            elif kind == INT:
+                self.columns[name] = array("q")
+            else:
+                self.columns[name] = []
+        self._length = 0
+        self.extend(rows)
+
+    def extend(self, rows: Iterable[dict]) -> None:
+        plan = self.model._plan
+        columns = [(self.columns[name], convert, keys) for name, convert, keys in plan]
+        for row in rows:
+            for column, convert, keys in columns:
+                value = None
+                for key in keys:
+                    value = row.get(key)
+                    if value is not None:
+                        break
+                column.append(convert(value))
+            self._length += 1
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> Model:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ModelTable index out of range")
+        obj = self.model.__new__(self.model)
+        for name, column in self.columns.items():
+            setattr(obj, name, column[index])
+        return obj
+
+    def __iter__(self) -> Iterator[Model]:
+        for index in range(self._length):
+            yield self[index]
+
+    def column(self, name: str) -> Union[array, list]:
+        return self.columns[name]
+
+    def where(self, name: str, value) -> List[int]:
+        """Row indexes whose column equals ``value`` (enum values compare upper-case)."""
+        column = self.columns[name]
+        if isinstance(value, str) and (name, ENUM) in {(f[0], f[1]) for f in self.model.FIELDS}:
+            value = value.upper()
+        return [i for i, v in enumerate(column) if v == value]
+
+    def to_dicts(self) -> List[dict]:
+        names = list(self.columns)
+        return [dict(zip(names, values)) for values in zip(*self.columns.values())]
+
+
+MODEL_FORMATS = (None, "objects", "columnar")
+
+
+def parse_rows(payload, model: type, form: Optional[str] = "objects"):
+    """Convert a broker response into models; responses without rows come back unchanged."""
+    if form not in MODEL_FORMATS:
+        raise ValueError(f"Unknown model format {form!r}; use one of {MODEL_FORMATS}")
+    if form is None:
+        return payload
+    if isinstance(payload, dict) and payload.get("stat") not in (None, "Ok") and not extract_rows(payload):
+        return payload
+    rows = extract_rows(payload)
+    if form == "columnar":
+        return ModelTable(model, rows)
+    from_row = model.from_row
+    return [from_row(row) for row in rows]
@@ -0,0 +1,200 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .utils import extract_rows
+
+TERMINAL_STATUSES = {"COMPLETE", "REJECTED", "CANCELLED", "CANCELED"}
+
+# Orders still waiting on a trigger rarely change, so they are polled more slowly
+SLOW_STATUSES = {"TRIGGER_PENDING", "AFTER MARKET ORDER REQ RECEIVED", "AMO REQ RECEIVED"}
+
+# (max order age in seconds, poll interval in seconds)
+AGE_INTERVALS = [(10, 0.5), (60, 1.0), (300, 2.5)]
+
+# Unwatched live orders keep their age this long, so repeated short waits do not restart it
+IDLE_RETENTION = 3600.0
+
+
+def order_status(row: dict) -> Optional[str]:
+    status = row.get("orderStatus") or row.get("status")
+    return status.upper() if isinstance(status, str) else None
+
+
+class WatchedOrder:
+    __slots__ = ("order_id", "since", "status", "row", "waiters")
+
+    def __init__(self, order_id: str):
+        self.order_id = order_id
+        self.since = time.monotonic()
+        self.status = None
+        self.row = None
+        self.waiters = 0
+
+    @property
+    def terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+class OrderTracker:
+    """Tracks many orders with a single shared order-book poll.
+
+    Every watched order shares one uncached ``get_order_book`` call per cycle. The
+    cycle interval is the shortest interval any live order asks for, which
+    grows with order age and is relaxed for orders waiting on a trigger.
+    An order's age counts from its first watch and survives later watches
+    until it is terminal.
+    """
+
+    def __init__(self, client, min_interval: float = 0.5, max_interval: float = 5.0):
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._orders: Dict[str, WatchedOrder] = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self.polls = 0
+        self._polled_at = 0.0
+        self.last_poll = None
+        self.last_error = None
+
+    def _order_interval(self, order: WatchedOrder, now: float) -> float:
+        age = now - order.since
+        interval = self.max_interval
+        for max_age, age_interval in AGE_INTERVALS:
+            if age < max_age:
+                interval = age_interval
+                break
+        if order.status in SLOW_STATUSES:
+            interval *= 2
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def next_interval(self) -> Optional[float]:
+        """Interval until the next poll, or None when nothing needs polling."""
+        now = time.monotonic()
+        live = [o for o in self._orders.values() if o.waiters and not o.terminal]
+        if not live:
+            return None
+        if self.last_error:
+            return self.max_interval
+        return min(self._order_interval(o, now) for o in live)
+
+    def watch(self, order_ids: Iterable[str]) -> None:
+        with self._cond:
+            self._prune()
+            for order_id in order_ids:
+                order = self._orders.get(order_id)
+                if order is None:
+                    order = self._orders[order_id] = WatchedOrder(order_id)
+                order.waiters += 1
+            self._ensure_poller()
+            self._cond.notify_all()
+
+    def unwatch(self, order_ids: Iterable[str]) -> None:
+        with self._cond:
+            for order_id in order_ids:
+                order = self._orders.get(order_id)
+                if order is not None:
+                    order.waiters -= 1
+            self._prune()
+
+    def _prune(self) -> None:
+        """Forget unwatched orders once terminal or idle for IDLE_RETENTION; caller holds the lock."""
+        now = time.monotonic()
+        for order_id in [o for o, order in self._orders.items()
+                         if order.waiters <= 0 and (order.terminal or now - order.since > IDLE_RETENTION)]:
+            del self._orders[order_id]
+
+    def poll(self) -> None:
+        """Fetch the order book once and update every watched order from it."""
+        try:
+            # Past the read cache: a cached book would delay status changes by its TTL
+            book = self.client.fetch("get_order_book")
+        except Exception as e:
+            with self._cond:
+                self.last_error = str(e)
+                self._cond.notify_all()
+            return
+
+        rows = {}
+        for row in extract_rows(book):
+            order_id = row.get("brokerOrderId") or row.get("orderId")
+            if order_id is not None:
+                rows[str(order_id)] = row
+
+        with self._cond:
+            self.polls += 1
+            self.last_poll = time.time()
+            self.last_error = None
+            for order_id, order in self._orders.items():
+                row = rows.get(order_id)
+                if row is not None:
+                    order.row = row
+                    order.status = order_status(row)
+            self._cond.notify_all()
+
+    def _ensure_poller(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="order-tracker", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                interval = self.next_interval()
+                if interval is None:
+                    self._thread = None
+                    return
+                # New watches wake the poller to recompute the interval, not to poll early
+                wait = self._polled_at + interval - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(timeout=wait)
+                    continue
+                self._polled_at = time.monotonic()
+            self.poll()
+
+    def snapshot(self, order_ids: Iterable[str]) -> Dict[str, dict]:
+        with self._cond:
+            return {
+                order_id: {
+                    "status": self._orders[order_id].status if order_id in self._orders else None,
+                    "order": self._orders[order_id].row if order_id in self._orders else None,
+                }
+                for order_id in order_ids
+            }
+
+    def wait_for(self, order_ids: List[str], target_statuses: Optional[Iterable[str]] = None,
+                 timeout: float = 30.0) -> dict:
+        """Block until every order reaches a target (default: terminal) status or timeout."""
+        targets = {s.upper() for s in target_statuses} if target_statuses else TERMINAL_STATUSES
+        order_ids = [str(o) for o in order_ids]
+        deadline = time.monotonic() + timeout
+
+        def settled() -> bool:
+            return all(
+                self._orders[o].status in targets or self._orders[o].terminal
+                for o in order_ids
+            )
+
+        self.watch(order_ids)
+        try:
+            with self._cond:
+                while not settled():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(timeout=remaining)
+                done = settled()
+                matched = all(self._orders[o].status in targets for o in order_ids)
+                error = self.last_error
+            result = {
+                "completed": matched,
+                "timed_out": not done,
+                "orders": self.snapshot(order_ids),
+                "polls": self.polls,
+            }
+            if error and not done:
+                result["last_error"] = error
+            return result
+        finally:
+            self.unwatch(order_ids)
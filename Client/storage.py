@@ -0,0 +1,284 @@
+import json
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Optional
+from urllib.parse import urlparse
+
+from .deadline import Deadline, DeadlineExceeded
+
+
+class StoreBackend:
+    """Key/value storage shared by sessions, read caches and rate-limit buckets.
+
+    Values must be JSON-serialisable so every backend can hold them.
+    """
+
+    def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Set ``key`` only if it is absent (or expired); return whether it was set."""
+        raise NotImplementedError
+
+    def take(self, key: str, rate: float, capacity: float, tokens: float = 1.0) -> float:
+        """Take tokens from a token bucket; return 0 on success or the seconds to wait."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryStore(StoreBackend):
+    """In-process backend; also the state behind ``StoreServer``."""
+
+    def __init__(self):
+        self._data = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+                self._buckets.pop(key, None)
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and (item[1] is None or item[1] > now):
+                return False
+            self._data[key] = (value, now + ttl if ttl else None)
+            return True
+
+    def take(self, key: str, rate: float, capacity: float, tokens: float = 1.0) -> float:
+        now = time.monotonic()
+        with self._lock:
+            level, updated = self._buckets.get(key, (capacity, now))
+            level = min(capacity, level + (now - updated) * rate)
+            if level >= tokens:
+                self._buckets[key] = (level - tokens, now)
+                return 0.0
+            self._buckets[key] = (level, now)
+            return (tokens - level) / rate
+
+
+class NetworkStore(StoreBackend):
+    """Client for a ``StoreServer`` speaking one JSON object per line over TCP."""
+
+    def __init__(self, host: str, port: int, timeout: float = 2.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._sock.makefile("rwb")
+
+    def _disconnect(self):
+        for resource in (self._file, self._sock):
+            try:
+                if resource:
+                    resource.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._file = None
+
+    def _call(self, op: str, **params) -> Any:
+        line = json.dumps(dict(params, op=op), separators=(",", ":")).encode() + b"\n"
+        with self._lock:
+            # One reconnect attempt covers a server restart or an idle socket being dropped
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._file.write(line)
+                    self._file.flush()
+                    reply = self._file.readline()
+                    if not reply:
+                        raise ConnectionError("Store connection closed")
+                    break
+                except OSError as e:
+                    self._disconnect()
+                    if attempt:
+                        raise ConnectionError(f"Store {self.host}:{self.port} unavailable: {e}")
+        response = json.loads(reply)
+        if not response.get("ok"):
+            raise Exception(f"Store Error: {response.get('error')}")
+        return response.get("value")
+
+    def get(self, key: str) -> Any:
+        return self._call("get", key=key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._call("set", key=key, value=value, ttl=ttl)
+
+    def delete(self, *keys: str) -> None:
+        self._call("delete", keys=list(keys))
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        return self._call("add", key=key, value=value, ttl=ttl)
+
+    def take(self, key: str, rate: float, capacity: float, tokens: float = 1.0) -> float:
+        return self._call("take", key=key, rate=rate, capacity=capacity, tokens=tokens)
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+
+class _StoreRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        store = self.server.store
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                op = request.get("op")
+                if op == "get":
+                    value = store.get(request["key"])
+                elif op == "set":
+                    value = store.set(request["key"], request.get("value"), request.get("ttl"))
+                elif op == "delete":
+                    value = store.delete(*request.get("keys", []))
+                elif op == "add":
+                    value = store.add(request["key"], request.get("value"), request.get("ttl"))
+                elif op == "take":
+                    value = store.take(request["key"], request["rate"], request["capacity"],
+                                       request.get("tokens", 1.0))
+                elif op == "ping":
+                    value = "pong"
+                else:
+                    raise ValueError(f"Unknown op: {op}")
+                response = {"ok": True, "value": value}
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+            self.wfile.flush()
+
+
+class StoreServer(socketserver.ThreadingTCPServer):
+    """Serves a ``MemoryStore`` to ``NetworkStore`` clients.
+
+    Run it as the shared store for several server replicas, or in-process on
+    port 0 as a local stand-in.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, store: Optional[MemoryStore] = None):
+        super().__init__((host, port), _StoreRequestHandler)
+        self.store = store or MemoryStore()
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"tcp://{host}:{port}"
+
+    def start(self) -> "StoreServer":
+        self.thread = threading.Thread(target=self.serve_forever, name="store-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def store_from_url(url: Optional[str]) -> StoreBackend:
+    """``memory://`` (or empty) for a local store, ``tcp://host:port`` for a StoreServer."""
+    if not url or url.startswith("memory://"):
+        return MemoryStore()
+    parsed = urlparse(url)
+    if parsed.scheme != "tcp" or not parsed.hostname or not parsed.port:
+        raise ValueError(f"Unsupported store URL: {url}")
+    return NetworkStore(parsed.hostname, parsed.port)
+
+
+class RateLimiter:
+    """Token bucket kept in a store so every replica draws from one budget."""
+
+    def __init__(self, store: StoreBackend, key: str, rate: float, capacity: Optional[float] = None):
+        self.store = store
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.waited = 0.0
+
+    def acquire(self, tokens: float = 1.0, deadline: Optional[Deadline] = None) -> float:
+        """Block until tokens are available; return the seconds spent waiting.
+
+        With a ``deadline``, a wait that would outlast it raises
+        ``DeadlineExceeded`` straight away instead of sleeping first.
+        """
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            wait = self.store.take(self.key, self.rate, self.capacity, tokens)
+            if not wait:
+                self.waited += waited
+                return waited
+            if deadline is not None and wait >= deadline.remaining():
+                self.waited += waited
+                raise DeadlineExceeded("rate_limit", deadline)
+            time.sleep(wait)
+            waited += wait
+
+
+class ReadCache:
+    """TTL cache of read responses kept in a store."""
+
+    def __init__(self, store: StoreBackend, prefix: str):
+        self.store = store
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, name: str) -> str:
+        return f"{self.prefix}:{name}"
+
+    def get_or_fetch(self, name: str, ttl: float, fetch: Callable[[], Any]) -> Any:
+        key = self.key(name)
+        cached = self.store.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        value = fetch()
+        self.store.set(key, value, ttl)
+        return value
+
+    def invalidate(self, *names: str) -> None:
+        self.store.delete(*(self.key(name) for name in names))
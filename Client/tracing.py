@@ -0,0 +1,214 @@
+import contextlib
+import contextvars
+import itertools
+import json
+import random
+import threading
+import time
+import urllib.request
+from collections import deque
+from typing import List, Optional
+
+from .config import TRACE_SAMPLE_RATE, TRACE_SLOW_MS, TRACE_BUFFER, TRACE_EXPORT_URL
+
+_current: contextvars.ContextVar = contextvars.ContextVar("span", default=None)
+_ids = itertools.count(1)
+
+
+class Span:
+    __slots__ = ("trace", "name", "span_id", "parent_id", "start", "end", "attrs", "children")
+
+    def __init__(self, trace: "Trace", name: str, parent: Optional["Span"] = None, attrs: Optional[dict] = None):
+        self.trace = trace
+        self.name = name
+        self.span_id = next(_ids)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start = time.perf_counter()
+        self.end = None
+        self.attrs = attrs or {}
+        self.children: List[Span] = []
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def describe(self, origin: float) -> dict:
+        info = {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round(self.duration_ms, 3),
+        }
+        if self.attrs:
+            info["attrs"] = self.attrs
+        if self.children:
+            children = list(self.children)
+            info["self_ms"] = round(self.duration_ms - sum(c.duration_ms for c in children), 3)
+            info["children"] = [c.describe(origin) for c in children]
+        return info
+
+
+class Trace:
+    __slots__ = ("trace_id", "sampled", "started_at", "root")
+
+    def __init__(self, sampled: bool):
+        self.trace_id = f"{random.getrandbits(64):016x}"
+        self.sampled = sampled
+        self.started_at = time.time()
+        self.root: Optional[Span] = None
+
+    def describe(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "sampled": self.sampled,
+            "started_at": self.started_at,
+            "duration_ms": round(self.root.duration_ms, 3),
+            "root": self.root.describe(self.root.start),
+        }
+
+
+class Tracer:
+    """Lightweight span tracer from tool call down to each broker HTTP attempt.
+
+    A fraction ``sample_rate`` of traces records child spans. Every trace
+    times its root, so a slow call is kept in the ring buffer even when
+    unsampled, just without its breakdown. Finished sampled traces go to
+    ``export_url`` (if set) as JSON batches from a background thread.
+    """
+
+    def __init__(self, sample_rate: float = 0.1, slow_ms: float = 500, buffer_size: int = 200,
+                 export_url: str = "", export_batch: int = 50):
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.slow = deque(maxlen=buffer_size)
+        self.export_url = export_url
+        self.export_batch = export_batch
+        self._export_queue = deque(maxlen=10000)
+        self._export_cond = threading.Condition()
+        self._exporter = None
+        self.traces = 0
+        self.sampled = 0
+        self.exported = 0
+        self.export_errors = 0
+
+    @contextlib.contextmanager
+    def trace(self, name: str, **attrs):
+        """Root span; nested calls inside an existing trace become child spans instead."""
+        if _current.get() is not None:
+            with self.span(name, **attrs) as span:
+                yield span
+            return
+        trace = Trace(sampled=random.random() < self.sample_rate)
+        root = trace.root = Span(trace, name, attrs=attrs)
+        token = _current.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.set(error=type(e).__name__)
+            raise
+        finally:
+            root.end = time.perf_counter()
+            _current.reset(token)
+            self._finish(trace)
+
+    @contextlib.contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **attrs):
+        """Child span of ``parent`` or the current span; a no-op outside a sampled trace."""
+        parent = parent if parent is not None else _current.get()
+        if parent is None or not parent.trace.sampled:
+            yield None
+            return
+        span = Span(parent.trace, name, parent, attrs)
+        parent.children.append(span)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=type(e).__name__)
+            raise
+        finally:
+            span.end = time.perf_counter()
+            _current.reset(token)
+
+    def record(self, name: str, start: float, end: float, parent: Optional[Span] = None, **attrs) -> None:
+        """Add an already-finished span, e.g. time a job spent queued before a worker took it."""
+        parent = parent if parent is not None else _current.get()
+        if parent is None or not parent.trace.sampled:
+            return
+        span = Span(parent.trace, name, parent, attrs)
+        span.start, span.end = start, end
+        parent.children.append(span)
+
+    def _finish(self, trace: Trace) -> None:
+        self.traces += 1
+        if trace.sampled:
+            self.sampled += 1
+        if trace.root.duration_ms >= self.slow_ms:
+            self.slow.append(trace)
+        if trace.sampled and self.export_url:
+            with self._export_cond:
+                self._export_queue.append(trace)
+                if self._exporter is None:
+                    self._exporter = threading.Thread(target=self._export_loop, name="trace-exporter", daemon=True)
+                    self._exporter.start()
+                self._export_cond.notify()
+
+    def _export_loop(self) -> None:
+        while True:
+            with self._export_cond:
+                while not self._export_queue:
+                    self._export_cond.wait()
+                batch = [self._export_queue.popleft() for _ in range(min(self.export_batch, len(self._export_queue)))]
+            body = json.dumps({"traces": [t.describe() for t in batch]}).encode()
+            request = urllib.request.Request(self.export_url, data=body, headers={"Content-Type": "application/json"})
+            try:
+                urllib.request.urlopen(request, timeout=2.0).close()
+                self.exported += len(batch)
+            except Exception:
+                self.export_errors += 1
+
+    def slow_traces(self, limit: int = 20, min_ms: Optional[float] = None, name: Optional[str] = None) -> List[dict]:
+        """Most recent slow traces first."""
+        found = []
+        for trace in reversed(list(self.slow)):
+            if min_ms is not None and trace.root.duration_ms < min_ms:
+                continue
+            if name is not None and trace.root.name != name:
+                continue
+            found.append(trace.describe())
+            if len(found) >= limit:
+                break
+        return found
+
+    def stats(self) -> dict:
+        return {
+            "traces": self.traces,
+            "sampled": self.sampled,
+            "slow_buffered": len(self.slow),
+            "sample_rate": self.sample_rate,
+            "slow_ms": self.slow_ms,
+            "exported": self.exported,
+            "export_errors": self.export_errors,
+        }
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer configured from TRACE_* settings."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(TRACE_SAMPLE_RATE, TRACE_SLOW_MS, TRACE_BUFFER, TRACE_EXPORT_URL)
+    return _tracer
+
+
+def span(name: str, parent: Optional[Span] = None, **attrs):
+    return get_tracer().span(name, parent, **attrs)
@@ -0,0 +1,180 @@
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Keys whose values never reach a recording, in request or response bodies.
+# Plain "token" is the instrument token in broker rows, not a secret.
+REDACTED_KEYS = {"authorization", "usersession", "checksum", "authcode", "apisecret", "api_secret",
+                 "password", "accesstoken", "refreshtoken", "session", "susertoken"}
+RECORDED_HEADERS = ("Content-Type", "Content-Encoding", "Content-Length", "ETag", "Last-Modified")
+REDACTED = "***"
+
+
+def redact(value):
+    """Return a copy of a JSON value with secret fields masked."""
+    if isinstance(value, dict):
+        return {k: REDACTED if k.lower() in REDACTED_KEYS else redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v) for v in value]
+    return value
+
+
+def _open_log(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class HttpTransport:
+    """Default transport: a pooled ``requests.Session``."""
+
+    def __init__(self, session: Optional[requests.Session] = None):
+        self.session = session or requests.Session()
+
+    def request(self, method: str, url: str, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+class RecordingTransport:
+    """Wraps a transport and appends every exchange to a JSONL log (``.gz`` for gzip).
+
+    Each line holds the method, URL, redacted request body, status, selected
+    headers, redacted response body and the upstream latency in ms.
+    """
+
+    def __init__(self, inner, path: str):
+        self.inner = inner
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = _open_log(path, "a")
+        self.recorded = 0
+
+    def request(self, method: str, url: str, **kwargs):
+        started = time.time()
+        t0 = time.perf_counter()
+        error = None
+        res = None
+        try:
+            res = self.inner.request(method, url, **kwargs)
+            return res
+        except requests.exceptions.RequestException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._write(started, (time.perf_counter() - t0) * 1000, method, url, kwargs.get("json"), res, error)
+
+    def _write(self, started, elapsed_ms, method, url, body, res, error):
+        entry = {"ts": round(started, 3), "ms": round(elapsed_ms, 2), "method": method, "url": url}
+        if body is not None:
+            entry["req"] = redact(body)
+        if error:
+            entry["error"] = error
+        if res is not None:
+            entry["status"] = res.status_code
+            entry["headers"] = {h: res.headers[h] for h in RECORDED_HEADERS if h in res.headers}
+            try:
+                entry["body"] = redact(res.json())
+            except ValueError:
+                entry["text"] = res.text
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.recorded += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+        if hasattr(self.inner, "close"):
+            self.inner.close()
+
+
+class RecordedResponse:
+    """Just enough of ``requests.Response`` for the client to consume a recording."""
+
+    def __init__(self, entry: dict):
+        self.status_code = entry.get("status", 200)
+        self.headers = CaseInsensitiveDict(entry.get("headers") or {})
+        self.url = entry.get("url")
+        if "body" in entry:
+            self.text = json.dumps(entry["body"], separators=(",", ":"))
+        else:
+            self.text = entry.get("text", "")
+        self.content = self.text.encode("utf-8")
+        self._json = entry.get("body")
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self):
+        if self._json is None:
+            return json.loads(self.text)
+        return self._json
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class ReplayTransport:
+    """Serves recorded exchanges back in order per (method, path).
+
+    ``latency_scale`` multiplies the recorded upstream latency (0 disables
+    sleeping). With ``loop`` a route restarts from its first recording once
+    exhausted, so a short capture can drive a long load test.
+    """
+
+    def __init__(self, path: str, latency_scale: float = 1.0, loop: bool = True):
+        self.path = path
+        self.latency_scale = latency_scale
+        self.loop = loop
+        self._routes = defaultdict(list)
+        self._queues = {}
+        self._lock = threading.Lock()
+        with _open_log(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._routes[self._route(entry["method"], entry["url"])].append(entry)
+        self.served = 0
+
+    @staticmethod
+    def _route(method: str, url: str):
+        return method.upper(), urlparse(url).path
+
+    def request(self, method: str, url: str, **kwargs):
+        route = self._route(method, url)
+        with self._lock:
+            queue = self._queues.get(route)
+            if not queue:
+                if not self._routes.get(route) or (route in self._queues and not self.loop):
+                    raise requests.exceptions.ConnectionError(f"No recording for {method} {route[1]}")
+                queue = self._queues[route] = deque(self._routes[route])
+            entry = queue.popleft()
+            self.served += 1
+        if self.latency_scale:
+            delay = entry.get("ms", 0) / 1000.0 * self.latency_scale
+            timeout = kwargs.get("timeout")
+            read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+            # Honour the caller's read timeout the way a slow live socket would
+            if read_timeout is not None and delay > read_timeout:
+                time.sleep(read_timeout)
+                raise requests.exceptions.ReadTimeout(f"Replayed {method} {route[1]} took {delay:.3f}s")
+            time.sleep(delay)
+        if "error" in entry and "status" not in entry:
+            raise requests.exceptions.ConnectionError(entry["error"])
+        return RecordedResponse(entry)
+
+    def close(self):
+        pass
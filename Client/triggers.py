@@ -0,0 +1,304 @@
+import bisect
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+ABOVE, BELOW = "above", "below"
+
+# Parameters accepted by AliceBlue.get_place_order for a rule's action
+ORDER_FIELDS = ("instrument_id", "exchange", "transaction_type", "quantity", "order_type", "product",
+                "order_complexity", "price", "validity")
+ORDER_DEFAULTS = {"order_type": "MARKET", "product": "INTRADAY", "order_complexity": "REGULAR",
+                  "price": 0, "validity": "DAY"}
+
+
+class Leg:
+    """One trigger level of a rule; trailing legs move their level with the price."""
+
+    __slots__ = ("rule", "direction", "level", "trail", "mark", "seq")
+
+    def __init__(self, rule: "Rule", direction: str, level: float, trail: Optional[float] = None,
+                 mark: Optional[float] = None):
+        self.rule = rule
+        self.direction = direction
+        self.level = level
+        self.trail = trail
+        self.mark = mark
+        self.seq = 0
+
+    def describe(self) -> dict:
+        info = {"direction": self.direction, "level": round(self.level, 4)}
+        if self.trail is not None:
+            info.update(trail=self.trail, mark=self.mark)
+        return info
+
+
+class Rule:
+    __slots__ = ("rule_id", "kind", "key", "action", "legs", "state", "created", "fired_at", "fired_price",
+                 "result", "error")
+
+    def __init__(self, rule_id: str, kind: str, key: str, action: dict):
+        self.rule_id = rule_id
+        self.kind = kind
+        self.key = key
+        self.action = action
+        self.legs: List[Leg] = []
+        self.state = "active"
+        self.created = time.time()
+        self.fired_at = None
+        self.fired_price = None
+        self.result = None
+        self.error = None
+
+    def describe(self) -> dict:
+        return {
+            "rule_id": self.rule_id,
+            "kind": self.kind,
+            "instrument": self.key,
+            "state": self.state,
+            "legs": [leg.describe() for leg in self.legs],
+            "action": self.action,
+            "created": self.created,
+            "fired_at": self.fired_at,
+            "fired_price": self.fired_price,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class InstrumentIndex:
+    """Trigger levels of one instrument, kept sorted for bisect lookups.
+
+    ``above``/``below`` hold ``(level, seq, leg)`` for legs firing when the
+    price rises to / falls to the level. Trailing legs are also kept in
+    ``trail_up``/``trail_down`` sorted by their price mark, so a tick only
+    touches the trailing legs whose mark it actually moves.
+    """
+
+    __slots__ = ("above", "below", "trail_up", "trail_down")
+
+    def __init__(self):
+        self.above = []
+        self.below = []
+        self.trail_up = []
+        self.trail_down = []
+
+    def __bool__(self) -> bool:
+        return bool(self.above or self.below)
+
+    @staticmethod
+    def _remove(entries: list, entry: tuple) -> None:
+        pos = bisect.bisect_left(entries, entry[:2])
+        if pos < len(entries) and entries[pos][1] == entry[1]:
+            del entries[pos]
+
+    def add(self, leg: Leg) -> None:
+        side = self.above if leg.direction == ABOVE else self.below
+        bisect.insort(side, (leg.level, leg.seq, leg))
+        if leg.trail is not None:
+            if leg.direction == BELOW:
+                bisect.insort(self.trail_up, (leg.mark, leg.seq, leg))
+            else:
+                bisect.insort(self.trail_down, (-leg.mark, leg.seq, leg))
+
+    def remove(self, leg: Leg) -> None:
+        side = self.above if leg.direction == ABOVE else self.below
+        self._remove(side, (leg.level, leg.seq))
+        if leg.trail is not None:
+            if leg.direction == BELOW:
+                self._remove(self.trail_up, (leg.mark, leg.seq))
+            else:
+                self._remove(self.trail_down, (-leg.mark, leg.seq))
+
+    def trail(self, price: float) -> None:
+        """Move trailing levels: long stops follow new highs, short stops new lows."""
+        end = bisect.bisect_left(self.trail_up, (price,))
+        if end:
+            moved, self.trail_up[:end] = self.trail_up[:end], []
+            for _, _, leg in moved:
+                self._remove(self.below, (leg.level, leg.seq))
+                leg.mark = price
+                leg.level = price - leg.trail
+                bisect.insort(self.below, (leg.level, leg.seq, leg))
+                bisect.insort(self.trail_up, (leg.mark, leg.seq, leg))
+        end = bisect.bisect_left(self.trail_down, (-price,))
+        if end:
+            moved, self.trail_down[:end] = self.trail_down[:end], []
+            for _, _, leg in moved:
+                self._remove(self.above, (leg.level, leg.seq))
+                leg.mark = price
+                leg.level = price + leg.trail
+                bisect.insort(self.above, (leg.level, leg.seq, leg))
+                bisect.insort(self.trail_down, (-leg.mark, leg.seq, leg))
+
+    def crossed(self, price: float) -> List[Leg]:
+        """Legs whose level the price has reached."""
+        legs = [leg for _, _, leg in self.above[:bisect.bisect_right(self.above, (price, float("inf")))]]
+        legs.extend(leg for _, _, leg in self.below[bisect.bisect_left(self.below, (price,)):])
+        return legs
+
+
+class ConditionalOrderEngine:
+    """Evaluates local OCO, trailing-stop and bracket-exit rules on every tick.
+
+    Feed it with ``store.add_listener(engine.on_quote)`` (or call ``on_tick``
+    directly). A fired rule is marked and unindexed on the tick thread, and its
+    order goes out through ``client.get_place_order`` on a small executor so a
+    slow broker call never holds up tick processing.
+    """
+
+    def __init__(self, client=None, max_workers: int = 4, latency_window: int = 1000):
+        self.client = client
+        self._indexes: Dict[str, InstrumentIndex] = {}
+        self._rules: Dict[str, Rule] = {}
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._seq = itertools.count(1)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="trigger-order")
+        self.ticks = 0
+        self.fired = 0
+        self.tick_to_order = deque(maxlen=latency_window)
+
+    # Registration
+
+    def _action(self, action: dict) -> dict:
+        order = dict(ORDER_DEFAULTS, **{k: v for k, v in action.items() if v is not None})
+        missing = [field for field in ORDER_FIELDS if field not in order]
+        if missing:
+            raise ValueError(f"Order action missing fields: {', '.join(missing)}")
+        return {field: order[field] for field in ORDER_FIELDS}
+
+    def _register(self, kind: str, key: str, action: dict, legs: List[tuple]) -> Rule:
+        rule = Rule(f"R{next(self._ids)}", kind, key, self._action(action))
+        with self._lock:
+            index = self._indexes.setdefault(key, InstrumentIndex())
+            for direction, level, trail, mark in legs:
+                leg = Leg(rule, direction, float(level), trail, mark)
+                leg.seq = next(self._seq)
+                rule.legs.append(leg)
+                index.add(leg)
+            self._rules[rule.rule_id] = rule
+        return rule
+
+    def add_trigger(self, key: str, direction: str, level: float, action: dict) -> Rule:
+        """Single-level stop or target."""
+        if direction not in (ABOVE, BELOW):
+            raise ValueError("direction must be 'above' or 'below'")
+        return self._register("trigger", key, action, [(direction, level, None, None)])
+
+    def add_oco(self, key: str, upper: float, lower: float, action: dict) -> Rule:
+        """Fire once when the price reaches either level; the other leg is dropped."""
+        if lower >= upper:
+            raise ValueError("lower must be below upper")
+        return self._register("oco", key, action, [(ABOVE, upper, None, None), (BELOW, lower, None, None)])
+
+    def add_trailing_stop(self, key: str, trail: float, reference: float, action: dict) -> Rule:
+        """Stop that trails the best price by ``trail``; a SELL action protects a long."""
+        if trail <= 0:
+            raise ValueError("trail must be positive")
+        if action.get("transaction_type", "SELL").upper() == "SELL":
+            leg = (BELOW, reference - trail, trail, reference)
+        else:
+            leg = (ABOVE, reference + trail, trail, reference)
+        return self._register("trailing_stop", key, action, [leg])
+
+    def add_bracket_exit(self, key: str, target: float, stop: float, action: dict,
+                         trail: Optional[float] = None, reference: Optional[float] = None) -> Rule:
+        """Target and stop for an open position; the stop may trail."""
+        selling = action.get("transaction_type", "SELL").upper() == "SELL"
+        if (stop >= target) if selling else (stop <= target):
+            raise ValueError("stop and target are on the wrong sides for this exit")
+        mark = None
+        if trail:
+            if reference is None:
+                reference = stop + trail if selling else stop - trail
+            mark = reference
+        stop_leg = (BELOW if selling else ABOVE, stop, trail or None, mark)
+        target_leg = (ABOVE if selling else BELOW, target, None, None)
+        return self._register("bracket_exit", key, action, [target_leg, stop_leg])
+
+    def cancel(self, rule_id: str) -> bool:
+        with self._lock:
+            rule = self._rules.get(rule_id)
+            if rule is None or rule.state != "active":
+                return False
+            self._unindex(rule)
+            rule.state = "cancelled"
+            return True
+
+    def _unindex(self, rule: Rule) -> None:
+        index = self._indexes.get(rule.key)
+        if index is None:
+            return
+        for leg in rule.legs:
+            index.remove(leg)
+        if not index:
+            del self._indexes[rule.key]
+
+    # Evaluation
+
+    def on_quote(self, quote) -> None:
+        if quote.ltp is not None:
+            self.on_tick(f"{quote.exchange}|{quote.instrument_id}", quote.ltp)
+
+    def on_tick(self, key: str, price: float) -> int:
+        """Evaluate one price update; returns the number of rules fired."""
+        received = time.perf_counter()
+        index = self._indexes.get(key)
+        self.ticks += 1
+        if index is None:
+            return 0
+        fired = []
+        with self._lock:
+            index.trail(price)
+            for leg in index.crossed(price):
+                rule = leg.rule
+                if rule.state != "active":
+                    continue
+                rule.state = "firing"
+                rule.fired_price = price
+                self._unindex(rule)
+                fired.append(rule)
+        for rule in fired:
+            self.fired += 1
+            self._executor.submit(self._execute, rule, received)
+        return len(fired)
+
+    def _execute(self, rule: Rule, received: float) -> None:
+        rule.fired_at = time.time()
+        self.tick_to_order.append(time.perf_counter() - received)
+        try:
+            rule.result = self.client.get_place_order(**rule.action)
+            rule.state = "fired"
+        except Exception as e:
+            rule.error = str(e)
+            rule.state = "error"
+
+    # Inspection
+
+    def get(self, rule_id: str) -> Optional[dict]:
+        rule = self._rules.get(rule_id)
+        return rule.describe() if rule else None
+
+    def list_rules(self, state: Optional[str] = None) -> List[dict]:
+        with self._lock:
+            rules = list(self._rules.values())
+        return [r.describe() for r in rules if state is None or r.state == state]
+
+    def stats(self) -> dict:
+        samples = sorted(self.tick_to_order)
+        pick = lambda q: round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1e6, 1) if samples else None
+        return {
+            "active_rules": sum(1 for r in self._rules.values() if r.state == "active"),
+            "instruments": len(self._indexes),
+            "ticks": self.ticks,
+            "fired": self.fired,
+            "tick_to_order_p50_us": pick(0.50),
+            "tick_to_order_p99_us": pick(0.99),
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait)
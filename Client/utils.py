@@ -45,3 +45,15 @@ def close_previous_login(current_server):
             pass
         finally:
             current_server = None
+
+def extract_rows(payload) -> list:
+    """Return the list of rows from a broker response (``result``/``data`` or a bare list)."""
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        rows = payload.get("result")
+        if rows is None:
+            rows = payload.get("data")
+        if isinstance(rows, list):
+            return rows
+    return []
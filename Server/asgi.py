@@ -0,0 +1,12 @@
+"""ASGI app for running the server under several uvicorn workers (see multiworker.py)."""
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from server import mcp
+
+# Stateless streamable HTTP: any worker can answer any request, so no sticky sessions are needed
+app = mcp.http_app(stateless_http=True)
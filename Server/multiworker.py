@@ -0,0 +1,58 @@
+"""Serve the MCP server from several worker processes.
+
+Usage:
+    python Server/multiworker.py [--workers 4] [--host 0.0.0.0] [--port 8000]
+
+Each uvicorn worker runs its own copy of the server. They share one broker
+session, the read cache and one upstream rate budget through a StoreServer
+started here, reached via STORE_URL. If STORE_URL already points to a
+``tcp://`` store, that store is used instead. The login lock in the store
+means only one worker ever opens the browser login.
+
+The conditional-order tools keep their rules in a single process, so they
+are disabled in this mode.
+"""
+import argparse
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from Client.config import SERVER_WORKERS
+from Client.storage import StoreServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the MCP server from several worker processes")
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS or os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--store-port", type=int, default=0, help="port for the shared store (0 picks one)")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    store = None
+    if not os.getenv("STORE_URL", "").startswith("tcp://"):
+        store = StoreServer(host="127.0.0.1", port=args.store_port).start()
+        os.environ["STORE_URL"] = store.url
+    os.environ["MULTIWORKER"] = "1"
+
+    print(f"🚀 Starting {args.workers} workers on {args.host}:{args.port} (shared store {os.environ['STORE_URL']})")
+    try:
+        uvicorn.run("asgi:app", host=args.host, port=args.port, workers=args.workers, app_dir=current_dir,
+                    log_level="warning")
+    finally:
+        if store is not None:
+            store.stop()
+
+
+if __name__ == "__main__":
+    main()
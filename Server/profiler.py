@@ -0,0 +1,140 @@
+import collections
+import os
+import re
+import sys
+import threading
+import time
+from typing import Dict
+
+MAX_SECONDS = 60.0
+MIN_INTERVAL = 0.001
+MAX_DEPTH = 128
+
+# Leaf frames of threads that are parked rather than working
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("socketserver.py", "serve_forever"),
+    ("queue.py", "get"),
+    ("socket.py", "readinto"),
+    ("socket.py", "accept"),
+    ("ssl.py", "read"),
+    ("thread.py", "_worker"),
+}
+
+_lock = threading.Lock()
+
+
+def thread_group(name: str) -> str:
+    """Collapse numbered pool threads into one group (``dispatch-3`` -> ``dispatch``)."""
+    if name.startswith("AnyIO worker thread"):
+        return "tool-worker"
+    if name.startswith("ThreadPoolExecutor"):
+        return "executor"
+    return re.sub(r"[-_ ]?\d+(_\d+)?$", "", name) or name
+
+
+def _frame_label(code) -> str:
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _is_idle(code) -> bool:
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+
+class ProfileBusy(Exception):
+    pass
+
+
+def sample(seconds: float = 5.0, interval: float = 0.005, include_idle: bool = False,
+           max_stacks: int = 200) -> dict:
+    """Statistically profile every thread of this process for ``seconds``.
+
+    The calling thread reads ``sys._current_frames()`` every ``interval``
+    seconds. Nothing is installed in other threads, so they run unmodified.
+    The result holds collapsed stacks (``thread;frame;...;frame count``,
+    which flamegraph.pl and speedscope read), the hottest functions and
+    per-thread-group sample counts. Only one profile runs at a time, and the
+    duration is capped at ``MAX_SECONDS``.
+    """
+    seconds = min(max(seconds, 0.1), MAX_SECONDS)
+    interval = max(interval, MIN_INTERVAL)
+    if not _lock.acquire(blocking=False):
+        raise ProfileBusy("A profile is already running")
+    try:
+        return _sample(seconds, interval, include_idle, max_stacks)
+    finally:
+        _lock.release()
+
+
+def _sample(seconds: float, interval: float, include_idle: bool, max_stacks: int) -> dict:
+    me = threading.get_ident()
+    stacks = collections.Counter()
+    own = collections.Counter()
+    threads: Dict[str, dict] = {}
+    names: Dict[int, str] = {}
+    samples = idle = 0
+    spent = 0.0
+    started = time.perf_counter()
+    stop_at = started + seconds
+    next_tick = started
+    while True:
+        now = time.perf_counter()
+        if now >= stop_at:
+            break
+        if now < next_tick:
+            time.sleep(next_tick - now)
+        # Under load, skip missed ticks instead of sampling back to back
+        next_tick = max(next_tick + interval, time.perf_counter())
+        t0 = time.perf_counter()
+        frames = sys._current_frames()
+        if len(names) != threading.active_count():
+            names = {t.ident: t.name for t in threading.enumerate()}
+        samples += 1
+        for ident, frame in frames.items():
+            if ident == me:
+                continue
+            group = thread_group(names.get(ident, f"thread-{ident}"))
+            stats = threads.setdefault(group, {"samples": 0, "idle": 0, "threads": set()})
+            stats["threads"].add(ident)
+            if _is_idle(frame.f_code):
+                stats["idle"] += 1
+                idle += 1
+                if not include_idle:
+                    continue
+            else:
+                stats["samples"] += 1
+            own[(group, _frame_label(frame.f_code))] += 1
+            labels = []
+            depth = 0
+            while frame is not None and depth < MAX_DEPTH:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+                depth += 1
+            labels.append(group)
+            stacks[";".join(reversed(labels))] += 1
+        del frames
+        spent += time.perf_counter() - t0
+    elapsed = time.perf_counter() - started
+
+    top_functions = [
+        {"thread": group, "function": label, "samples": count}
+        for (group, label), count in own.most_common(25)
+    ]
+    return {
+        "duration_s": round(elapsed, 3),
+        "interval_ms": round(interval * 1000, 3),
+        "ticks": samples,
+        "idle_samples": idle,
+        "include_idle": include_idle,
+        # Share of wall time the sampler itself held the GIL walking stacks
+        "overhead_pct": round(spent / elapsed * 100, 3) if elapsed else 0.0,
+        "threads": {
+            group: {"threads": len(stats["threads"]), "active_samples": stats["samples"], "idle_samples": stats["idle"]}
+            for group, stats in sorted(threads.items(), key=lambda item: -item[1]["samples"])
+        },
+        "top_functions": top_functions,
+        "collapsed": "\n".join(f"{stack} {count}" for stack, count in stacks.most_common(max_stacks)),
+        "distinct_stacks": len(stacks),
+    }
@@ -15,7 +15,19 @@ load_dotenv()
 # Import AliceBlue components
 try:
     from Client.client import AliceBlue
-    from Client.config import APP_KEY, API_SECRET
+    from Client.config import APP_KEY, API_SECRET, STORE_URL, RECORD_PATH, REPLAY_PATH, REPLAY_LATENCY_SCALE
+    from Client.config import DISPATCH_WORKERS, DISPATCH_QUEUE_SIZE, DISPATCH_STARVATION_MS
+    from Client.dispatcher import PriorityDispatcher
+    from Client.config import FEED_URL, MULTIWORKER
+    from Client.feed import FeedClient, QuoteStore
+    from Client.triggers import ConditionalOrderEngine
+    from Client.storage import store_from_url
+    from Client.transport import HttpTransport, RecordingTransport, ReplayTransport
+    from Client.order_tracker import OrderTracker
+    from Client.gtt_index import GttIndex
+    from Client.config import JOURNAL_DIR, JOURNAL_FSYNC_MS, JOURNAL_SEGMENT_MB
+    from Client.journal import JournalReader, OrderJournal, mark_gtt_refresh, restore_gtt_index
+    from Client.tracing import span
     CLIENT_IMPORTS_SUCCESSFUL = True
 except ImportError as e:
     print(f"❌ Failed to import Client modules: {e}")
@@ -32,6 +44,56 @@ class AliceBlueManager:
     def __init__(self):
         self.client = None
         self.initialized = False
+        self.order_tracker = None
+        self.gtt_index = None
+        self.store = None
+        self.dispatcher = None
+        self.quote_store = None
+        self.feed = None
+        self.trigger_engine = None
+        self.journal = None
+        self.journal_reader = None
+    
+    def get_dispatcher(self):
+        """Return the priority dispatcher, or None when DISPATCH_WORKERS is 0."""
+        if self.dispatcher is None and DISPATCH_WORKERS > 0:
+            self.dispatcher = PriorityDispatcher(
+                workers=DISPATCH_WORKERS,
+                max_queue=DISPATCH_QUEUE_SIZE,
+                starvation_after=DISPATCH_STARVATION_MS / 1000.0
+            )
+        return self.dispatcher
+    
+    def get_store(self):
+        """Return the session/cache/rate-limit store shared with other replicas."""
+        if self.store is None:
+            self.store = store_from_url(STORE_URL)
+        return self.store
+    
+    def get_journal(self):
+        """Return the order journal, or None when JOURNAL_DIR is not set."""
+        if self.journal is None and JOURNAL_DIR:
+            self.journal = OrderJournal(JOURNAL_DIR, fsync_interval=JOURNAL_FSYNC_MS / 1000.0,
+                                        max_bytes=JOURNAL_SEGMENT_MB << 20)
+            print(f"📒 Journaling orders to {self.journal.path}")
+        return self.journal
+    
+    def get_journal_reader(self):
+        """Return the journal reader; it keeps segment indexes between queries."""
+        if self.journal_reader is None and JOURNAL_DIR:
+            self.journal_reader = JournalReader(JOURNAL_DIR)
+        return self.journal_reader
+    
+    def make_transport(self):
+        """Build the client transport, honouring REPLAY_PATH / RECORD_PATH."""
+        if REPLAY_PATH:
+            print(f"📼 Replaying broker traffic from {REPLAY_PATH}")
+            return ReplayTransport(REPLAY_PATH, latency_scale=REPLAY_LATENCY_SCALE)
+        transport = HttpTransport()
+        if RECORD_PATH:
+            print(f"📼 Recording broker traffic to {RECORD_PATH}")
+            transport = RecordingTransport(transport, RECORD_PATH)
+        return transport
     
     def get_client(self, force_refresh: bool = False) -> AliceBlue:
         """Return a cached AliceBlue client, authenticate only when needed."""
@@ -47,21 +109,91 @@ class AliceBlueManager:
         if not app_key or not api_secret:
             raise Exception("Missing AliceBlue credentials")
 
-        self.client = AliceBlue(app_key=app_key, api_secret=api_secret)
+        self.client = AliceBlue(app_key=app_key, api_secret=api_secret, store=self.get_store(),
+                                transport=self.make_transport(), dispatcher=self.get_dispatcher(),
+                                journal=self.get_journal())
+        if REPLAY_PATH:
+            # Recorded traffic needs no broker login
+            self.client.user_session = "replay"
+            self.client.headers = {"Authorization": "Bearer replay"}
         self.initialized = True
         return self.client
     
     def ensure_authenticated(self):
         """Ensure the client is authenticated before making API calls."""
         if self.client and not getattr(self.client, 'user_session', None):
-            print("🔐 Authenticating AliceBlue client...")
-            self.client.authenticate()
-            print("✅ Authentication successful")
+            with span("auth"):
+                if self.client.load_shared_session():
+                    print("✅ Reusing shared session")
+                    return
+                print("🔐 Authenticating AliceBlue client...")
+                self.client.authenticate_once()
+                print("✅ Authentication successful")
+    
+    def get_order_tracker(self) -> OrderTracker:
+        """Return the order tracker bound to the current client."""
+        client = self.get_client()
+        if self.order_tracker is None or self.order_tracker.client is not client:
+            self.order_tracker = OrderTracker(client)
+        return self.order_tracker
+    
+    def get_gtt_index(self) -> GttIndex:
+        """Return the GTT index bound to the current client."""
+        client = self.get_client()
+        if self.gtt_index is None or self.gtt_index.client is not client:
+            if JOURNAL_DIR:
+                self.gtt_index = GttIndex(client, on_refresh=lambda at: mark_gtt_refresh(JOURNAL_DIR, at))
+                # Keep GTT changes made since the last book refresh until the broker's book shows them
+                applied = restore_gtt_index(self.get_journal_reader(), self.gtt_index)
+                print(f"📒 Replayed {applied} journaled GTT changes")
+            else:
+                self.gtt_index = GttIndex(client)
+        return self.gtt_index
+    
+    def get_quote_store(self) -> QuoteStore:
+        """Return the quote store; it outlives feed reconnects and re-logins."""
+        if self.quote_store is None:
+            self.quote_store = QuoteStore()
+        return self.quote_store
+    
+    def get_feed(self) -> FeedClient:
+        """Return a running market-data feed for the current session."""
+        client = self.get_client()
+        self.ensure_authenticated()
+        if self.feed is None or self.feed.session != client.user_session:
+            if self.feed is not None:
+                subscriptions = self.feed.subscriptions
+                self.feed.stop()
+            else:
+                subscriptions = []
+            self.feed = FeedClient(FEED_URL, client.user_id, client.user_session, store=self.get_quote_store())
+            self.feed.subscribe(subscriptions)
+            self.feed.start()
+        return self.feed
+    
+    def get_trigger_engine(self) -> ConditionalOrderEngine:
+        """Return the conditional-order engine, wired to the quote store and current client."""
+        if MULTIWORKER:
+            # A rule armed in one worker could not be listed or cancelled through another
+            raise Exception("Conditional orders keep their state in one process; run the server with a single worker")
+        client = self.get_client()
+        if self.trigger_engine is None:
+            self.trigger_engine = ConditionalOrderEngine(client)
+            self.get_quote_store().add_listener(self.trigger_engine.on_quote)
+        # Rules outlive re-logins; orders always go out through the live client
+        self.trigger_engine.client = client
+        return self.trigger_engine
     
     def close_session(self):
-        """Close the current session."""
+        """Close the current session and drop it from the shared store, so no replica reuses it."""
+        if self.client is not None:
+            self.client.store.delete(self.client.session_key)
+        else:
+            self.get_store().delete(f"session:{APP_KEY}")
         self.client = None
         self.initialized = False
+        self.order_tracker = None
+        self.gtt_index = None
 
 # Create global manager instance
 alice_manager = AliceBlueManager()
@@ -74,6 +206,14 @@ def ensure_authenticated():
     """Public function to ensure authentication."""
     alice_manager.ensure_authenticated()
 
+def get_order_tracker() -> OrderTracker:
+    """Public function to get the shared order tracker."""
+    return alice_manager.get_order_tracker()
+
+def get_gtt_index() -> GttIndex:
+    """Public function to get the shared GTT index."""
+    return alice_manager.get_gtt_index()
+
 def close_alice_session():
     """Public function to close session."""
     alice_manager.close_session()
@@ -81,6 +221,7 @@ def close_alice_session():
 # Import all tools (they will auto-register with server)
 try:
     sys.path.insert(0, current_dir)
+    import profiler
     from tools import *
     print("✅ All tools imported successfully")
 except ImportError as e:
@@ -129,6 +270,20 @@ def health_check() -> dict:
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+@mcp.tool()
+def profile_server(seconds: float = 5.0, interval_ms: float = 5.0, include_idle: bool = False,
+                   max_stacks: int = 200) -> dict:
+    """Sample every thread of the live server for a few seconds (max 60); returns per-thread
+    breakdowns, hottest functions and flamegraph-compatible collapsed stacks."""
+    try:
+        return {
+            "status": "success",
+            "data": profiler.sample(seconds=seconds, interval=interval_ms / 1000.0,
+                                    include_idle=include_idle, max_stacks=max_stacks)
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
 # Startup validation
 def validate_startup():
     """Validate that the server can start without immediate authentication."""
@@ -1,11 +1,45 @@
+import inspect
 import os
 import sys
-from typing import Optional, Union
+import time
+from collections import deque
+from typing import List, Optional
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
-from server import mcp, get_alice_client, ensure_authenticated, close_alice_session, alice_manager
+from server import mcp, get_alice_client, ensure_authenticated, close_alice_session, alice_manager, get_order_tracker, get_gtt_index
+from Client.analytics import portfolio_analytics
+from Client.feed import instrument_key
+from Client.endpoints import ENDPOINTS
+from Client.config import DEFAULT_TOOL_DEADLINE, TOOL_DEADLINES, DEADLINE_MARGIN_MS, ORDER_WAIT_MAX_TIMEOUT
+from Client.deadline import DeadlineExceeded, deadline_scope, current as current_deadline
+from Client.tracing import get_tracer
+from fastmcp.server.middleware import Middleware
+
+class ToolTracing(Middleware):
+    """Root span for every tool call; auth, queueing, HTTP and decode spans nest under it."""
+
+    async def on_call_tool(self, context, call_next):
+        with get_tracer().trace(f"tool:{context.message.name}"):
+            return await call_next(context)
+
+mcp.add_middleware(ToolTracing())
+
+@mcp.tool()
+def get_slow_traces(limit: int = 20, min_ms: Optional[float] = None, tool: Optional[str] = None) -> dict:
+    """Recent tool calls slower than TRACE_SLOW_MS with their span breakdown (auth, queue, rate limit, HTTP, decode)"""
+    try:
+        tracer = get_tracer()
+        return {
+            "status": "success",
+            "data": {
+                "traces": tracer.slow_traces(limit=limit, min_ms=min_ms, name=f"tool:{tool}" if tool else None),
+                "stats": tracer.stats()
+            }
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
 
 @mcp.tool()
 def check_and_authenticate() -> dict:
@@ -34,7 +68,10 @@ def initiate_login(force_refresh: bool = False) -> dict:
     """Login and create a new AliceBlue session if none exists or forced."""
     try:
         alice = get_alice_client(force_refresh=force_refresh)
-        alice.authenticate()  # Authenticate only when this tool is called
+        if force_refresh:
+            alice.store.delete(alice.session_key)
+        # Through the store's login lock, so only one worker opens the browser login
+        alice.authenticate_once()
 
         return {
             "status": "success",
@@ -64,315 +101,346 @@ def close_session() -> dict:
             "message": f"Error closing session: {e}"
         }
 
-@mcp.tool()
-def get_profile() -> dict:
-    """Fetches the user's profile details."""
-    try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return {"status": "success", "data": alice.get_profile()}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+def _tool_budget(name: str, deadline_ms: Optional[float]) -> float:
+    """Seconds a tool call may spend upstream: deadline_ms or the tool's configured default, less the reply margin."""
+    seconds = deadline_ms / 1000.0 if deadline_ms else TOOL_DEADLINES.get(name, DEFAULT_TOOL_DEADLINE)
+    return max(0.0, seconds - DEADLINE_MARGIN_MS / 1000.0)
+
+def _timeout_result(e: DeadlineExceeded) -> dict:
+    result = {
+        "status": "timeout",
+        "message": str(e),
+        "stage": e.stage,
+        # A read timeout means the request reached the broker and may still have been applied
+        "request_sent": e.stage == "http_read"
+    }
+    if e.deadline is not None:
+        result["budget_ms"] = round(e.deadline.budget * 1000)
+        result["elapsed_ms"] = round(e.deadline.elapsed() * 1000, 1)
+    if e.partial is not None:
+        result["partial"] = e.partial
+    return result
+
+def _bulk_result(results: List[dict]) -> dict:
+    """Success, or a timeout result carrying every item's outcome when the deadline cut the batch short."""
+    stopped = [r for r in results if r.get("status") in ("timeout", "skipped")]
+    if not stopped:
+        return {"status": "success", "data": results}
+    stage = next((r["stage"] for r in stopped if "stage" in r), "bulk")
+    return _timeout_result(DeadlineExceeded(stage, current_deadline(), partial=results))
+
+DEADLINE_PARAM = inspect.Parameter("deadline_ms", inspect.Parameter.POSITIONAL_OR_KEYWORD, default=None,
+                                   annotation=Optional[float])
+
+def _endpoint_tool(endpoint):
+    """Build the MCP tool for a registry endpoint: call the client method under the tool's deadline, wrap the result."""
+    signature = endpoint.tool_signature()
+    signature = signature.replace(parameters=list(signature.parameters.values()) + [DEADLINE_PARAM])
+
+    def tool(deadline_ms: Optional[float] = None, **kwargs):
+        try:
+            with deadline_scope(_tool_budget(endpoint.tool, deadline_ms)):
+                alice = get_alice_client()
+                ensure_authenticated()
+                return {"status": "success", "data": getattr(alice, endpoint.name)(**kwargs)}
+        except DeadlineExceeded as e:
+            return _timeout_result(e)
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    tool.__name__ = tool.__qualname__ = endpoint.tool
+    tool.__doc__ = endpoint.tool_doc
+    tool.__signature__ = signature
+    tool.__annotations__ = dict({p.name: p.annotation for p in signature.parameters.values()}, **{"return": dict})
+    return tool
+
+# One tool per registry endpoint, in registry order
+for _endpoint in ENDPOINTS:
+    if _endpoint.tool:
+        mcp.tool()(_endpoint_tool(_endpoint))
 
 @mcp.tool()
-def get_holdings() -> dict:
-    """Fetches the user's Holdings Stock"""
+def get_dispatch_metrics() -> dict:
+    """Queue depth, queue wait and latency per priority class (risk_exit, modify, place, read)."""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return {"status": "success", "data": alice.get_holdings()}
+        dispatcher = alice_manager.get_dispatcher()
+        if dispatcher is None:
+            return {"status": "success", "data": None, "message": "Priority dispatch is disabled"}
+        return {"status": "success", "data": dispatcher.stats()}
     except Exception as e:
         return {"status": "error", "message": str(e)}
-    
+
 @mcp.tool()
-def get_positions()-> dict:
-    """Fetches the user's Positions"""
+def get_fetch_metrics() -> dict:
+    """Bytes transferred, parse time and 304/unchanged counts of the conditional book reads, with recent calls."""
     try:
         alice = get_alice_client()
-        ensure_authenticated()
-        return{"status": "success", "data": alice.get_positions()}
+        if alice.fetcher is None:
+            return {"status": "success", "data": None, "message": "Conditional fetches are disabled"}
+        return {"status": "success", "data": alice.fetcher.stats()}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 @mcp.tool()
-def get_positions_sqroff(exch: str, symbol: str, qty: str, product: str, 
-                         transaction_type: str)-> dict:
-    """Position Square Off"""
+def get_order_journal(brokerOrderId: Optional[str] = None, since_minutes: Optional[float] = None,
+                      limit: int = 100) -> dict:
+    """Journaled order requests/responses with latencies: one order's history, or recent calls plus per-operation stats"""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
+        journal = alice_manager.get_journal()
+        if journal is None:
+            return {"status": "error", "message": "Order journal is disabled; set JOURNAL_DIR"}
+        journal.flush()
+        reader = alice_manager.get_journal_reader()
+        if brokerOrderId:
+            return {"status": "success", "data": {"entries": reader.for_order(brokerOrderId)[-limit:]}}
+        since = time.time() - since_minutes * 60 if since_minutes else None
+        entries = deque(reader.entries(since=since), maxlen=limit)
         return {
-            "status":"success",
-            "data": alice.get_positions_sqroff(
-                exch=exch,
-                symbol=symbol,
-                qty=qty,
-                product=product,
-                transaction_type=transaction_type
-            )
+            "status": "success",
+            "data": {"entries": list(entries), "summary": reader.summary(since=since), "writer": journal.stats()}
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 @mcp.tool()
-def get_position_conversion(exchange: str, validity: str, prevProduct: str, product: str, quantity: int, 
-                            tradingSymbol: str, transactionType: str, orderSource: str)->dict:
-    """Position conversion"""
+def get_portfolio_analytics(include_positions: bool = True, include_holdings: bool = True,
+                            top_n: int = 10, deadline_ms: Optional[float] = None) -> dict:
+    """Net exposure, P&L, concentration and per-product/exchange aggregates of positions and holdings"""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return{
-            "status":"success",
-            "data": alice.get_position_conversion(
-                exchange=exchange,
-                validity=validity,
-                prevProduct=prevProduct,
-                product=product,
-                quantity=quantity,
-                tradingSymbol=tradingSymbol,
-                transactionType=transactionType,
-                orderSource=orderSource
-            )
-        }
+        with deadline_scope(_tool_budget("get_portfolio_analytics", deadline_ms)):
+            alice = get_alice_client()
+            ensure_authenticated()
+            return {
+                "status": "success",
+                "data": portfolio_analytics(
+                    positions=alice.get_positions() if include_positions else None,
+                    holdings=alice.get_holdings() if include_holdings else None,
+                    top_n=top_n
+                )
+            }
+    except DeadlineExceeded as e:
+        return _timeout_result(e)
     except Exception as e:
         return {"status": "error", "message": str(e)}
-    
+
 @mcp.tool()
-def place_order(instrument_id: str, exchange: str, transaction_type: str, quantity: int, order_type: str, product: str,
-                    order_complexity: str, price: float, validity: str) -> dict:
-    """Places an order for the given stock."""
+def wait_for_order_status(brokerOrderIds: List[str], target_statuses: Optional[List[str]] = None,
+                          timeout: float = 30.0) -> dict:
+    """Wait until orders reach a target status (default: COMPLETE/REJECTED/CANCELLED) or timeout (capped at 120s by default)."""
     try:
-        alice = get_alice_client()
+        get_alice_client()
         ensure_authenticated()
+        tracker = get_order_tracker()
         return {
             "status": "success",
-            "data": alice.get_place_order(
-                instrument_id = instrument_id,
-                exchange=exchange,
-                transaction_type=transaction_type,
-                quantity = quantity,
-                order_type = order_type,
-                product = product,
-                order_complexity = order_complexity,
-                price=price,
-                validity = validity
+            "data": tracker.wait_for(
+                order_ids=brokerOrderIds,
+                target_statuses=target_statuses,
+                timeout=min(max(timeout, 0.0), ORDER_WAIT_MAX_TIMEOUT)
             )
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 @mcp.tool()
-def get_order_book()-> dict:
-    """Fetches Order Book"""
+def get_gtt_orders_near_price(instrumentId: str, price: float, percent: float = 1.0,
+                              refresh: bool = False, deadline_ms: Optional[float] = None) -> dict:
+    """Find GTT orders whose gttValue lies within percent of a price (e.g. the LTP)"""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return {
-            "status": "success",
-            "data": alice.get_order_book()
-        }
+        with deadline_scope(_tool_budget("get_gtt_orders_near_price", deadline_ms)):
+            get_alice_client()
+            ensure_authenticated()
+            index = get_gtt_index()
+            if refresh:
+                index.refresh()
+            else:
+                index.ensure_fresh()
+            return {
+                "status": "success",
+                "data": index.near(instrumentId, price, percent)
+            }
+    except DeadlineExceeded as e:
+        return _timeout_result(e)
     except Exception as e:
         return {"status": "error", "message": str(e)}
-    
+
 @mcp.tool()
-def get_order_history(brokerOrderId: str)-> dict:
-    """Fetchs Orders History"""
+def bulk_place_gtt_orders(orders: List[dict], deadline_ms: Optional[float] = None) -> dict:
+    """Place several GTT orders; each item takes the same fields as get_place_gtt_order"""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return{
-            "status": "success",
-            "data": alice.get_order_history(
-                brokerOrderId=brokerOrderId
-            )
-        }
+        with deadline_scope(_tool_budget("bulk_place_gtt_orders", deadline_ms)):
+            get_alice_client()
+            ensure_authenticated()
+            return _bulk_result(get_gtt_index().bulk_place(orders))
+    except DeadlineExceeded as e:
+        return _timeout_result(e)
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 @mcp.tool()
-def get_modify_order(brokerOrderId:str, validity: str , quantity: Optional[int] = None,
-                     price: Optional[Union[int, float]] = None, triggerPrice: Optional[float] = None)-> dict:
-    """Modify Order"""
+def bulk_modify_gtt_orders(modifications: List[dict], deadline_ms: Optional[float] = None) -> dict:
+    """Modify several GTT orders; each item needs brokerOrderId plus only the fields to change"""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return {
-            "status": "success",
-            "data": alice.get_modify_order(
-                brokerOrderId = brokerOrderId,
-                quantity= quantity if quantity else "",
-                validity= validity,
-                price= price if price else "",
-                triggerPrice=triggerPrice if triggerPrice else ""
-            )
-        }
+        with deadline_scope(_tool_budget("bulk_modify_gtt_orders", deadline_ms)):
+            get_alice_client()
+            ensure_authenticated()
+            return _bulk_result(get_gtt_index().bulk_modify(modifications))
+    except DeadlineExceeded as e:
+        return _timeout_result(e)
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 @mcp.tool()
-def get_cancel_order(brokerOrderId: str)-> dict:
-    """Cancel Order"""
+def bulk_cancel_gtt_orders(brokerOrderIds: Optional[List[str]] = None, instrumentId: Optional[str] = None,
+                           min_value: Optional[float] = None, max_value: Optional[float] = None,
+                           deadline_ms: Optional[float] = None) -> dict:
+    """Cancel GTT orders by id, or every GTT of an instrument with gttValue in [min_value, max_value]"""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return {
-            "status": "success",
-            "data": alice.get_cancel_order(
-                brokerOrderId=brokerOrderId
-            )
-        }
+        with deadline_scope(_tool_budget("bulk_cancel_gtt_orders", deadline_ms)):
+            get_alice_client()
+            ensure_authenticated()
+            return _bulk_result(get_gtt_index().bulk_cancel(
+                order_ids=brokerOrderIds,
+                instrument_id=instrumentId,
+                low=min_value,
+                high=max_value
+            ))
+    except DeadlineExceeded as e:
+        return _timeout_result(e)
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+def _wait_for_quotes(store, keys: List[str], wait_ms: float) -> dict:
+    deadline = time.monotonic() + wait_ms / 1000.0
+    while time.monotonic() < deadline and any(store.get(k) is None for k in keys):
+        time.sleep(0.01)
+    now = time.time()
+    quotes = {}
+    for key in keys:
+        quote = store.get(key)
+        if quote is None:
+            quotes[key] = None
+        else:
+            quotes[key] = dict(quote._asdict(), age_ms=round((now - quote.received_at) * 1000, 1))
+    return quotes
+
 @mcp.tool()
-def get_trade_book()-> dict:
-    """Fetches Trade Book"""
+def get_quote(instrumentId: str, exchange: str = "NSE", wait_ms: float = 2000) -> dict:
+    """Latest quote (LTP, OHLC, best bid/ask) from the in-memory feed; subscribes on first use"""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return{
+        feed = alice_manager.get_feed()
+        key = instrument_key(instrumentId, exchange)
+        if feed.store.get(key) is None:
+            feed.subscribe([key])
+        return {
             "status": "success",
-            "data": alice.get_trade_book()
+            "data": _wait_for_quotes(feed.store, [key], wait_ms)[key]
         }
     except Exception as e:
-        return {"status": "error", "message" : str(e)}
+        return {"status": "error", "message": str(e)}
 
 @mcp.tool()
-def get_order_margin(exchange:str, instrumentId:str, transactionType:str, quantity:int, product:str, 
-                         orderComplexity:str, orderType:str, validity:str, price=0.0, 
-                         slTriggerPrice: Optional[Union[int, float]] = None)-> dict:
-    """Order Margin"""
+def get_quotes(instruments: List[str], wait_ms: float = 2000) -> dict:
+    """Latest quotes for instruments given as "EXCHANGE|instrumentId" (e.g. "NSE|2885")"""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return{
+        feed = alice_manager.get_feed()
+        keys = [instrument_key(i) for i in instruments]
+        feed.subscribe([k for k in keys if feed.store.get(k) is None])
+        return {
             "status": "success",
-            "data": alice.get_order_margin(
-                exchange=exchange,
-                instrumentId = instrumentId,
-                transactionType=transactionType,
-                quantity=quantity,
-                product=product,
-                orderComplexity=orderComplexity,
-                orderType=orderType,
-                validity=validity,
-                price=price,
-                slTriggerPrice= slTriggerPrice if slTriggerPrice is not None else ""
-            )
+            "data": _wait_for_quotes(feed.store, keys, wait_ms)
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 @mcp.tool()
-def get_exit_bracket_order(brokerOrderId: str, orderComplexity:str)->dict:
-    """Exit Bracket Order"""
+def unsubscribe_quotes(instruments: List[str]) -> dict:
+    """Stop streaming quotes for instruments given as EXCHANGE|instrumentId"""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return {
-            "status": "success",
-            "data": alice.get_exit_bracket_order(
-                brokerOrderId=brokerOrderId,
-                orderComplexity=orderComplexity
-            )
-        }
+        feed = alice_manager.get_feed()
+        feed.unsubscribe([instrument_key(i) for i in instruments])
+        return {"status": "success", "data": {"subscriptions": feed.subscriptions}}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+
+def _register_rule(register, instrumentId: str, exchange: str) -> dict:
+    engine = alice_manager.get_trigger_engine()
+    feed = alice_manager.get_feed()
+    key = instrument_key(instrumentId, exchange)
+    feed.subscribe([key])
+    rule = register(engine, key)
+    return {"status": "success", "data": rule.describe()}
+
+def _rule_action(instrumentId: str, exchange: str, transaction_type: str, quantity: int, product: str,
+                 order_type: str, price: float) -> dict:
+    return {
+        "instrument_id": instrumentId,
+        "exchange": exchange,
+        "transaction_type": transaction_type,
+        "quantity": quantity,
+        "product": product,
+        "order_type": order_type,
+        "price": price,
+    }
+
 @mcp.tool()
-def get_place_gtt_order(tradingSymbol: str, exchange: str, transactionType: str, orderType: str,
-                            product: str, validity: str, quantity: int, price: float, orderComplexity: str, 
-                            instrumentId: str, gttType: str, gttValue: float)->dict:
-    """Place GTT Order"""
+def register_oco_order(instrumentId: str, exchange: str, transaction_type: str, quantity: int,
+                       upper: float, lower: float, product: str = "INTRADAY", order_type: str = "MARKET",
+                       price: float = 0) -> dict:
+    """Place one order when the LTP reaches either upper or lower; the other leg is dropped"""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return {
-            "status": "success",
-            "data": alice.get_place_gtt_order(
-                tradingSymbol=tradingSymbol,
-                exchange=exchange,
-                transactionType=transactionType,
-                orderType=orderType,
-                product=product,
-                validity=validity,
-                quantity=quantity,
-                price=price,
-                orderComplexity=orderComplexity,
-                instrumentId = instrumentId,
-                gttType=gttType,
-                gttValue=gttValue
-            )
-        }
+        action = _rule_action(instrumentId, exchange, transaction_type, quantity, product, order_type, price)
+        return _register_rule(lambda engine, key: engine.add_oco(key, upper, lower, action), instrumentId, exchange)
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 @mcp.tool()
-def get_gtt_order_book():
-    """Fetches GTT Order Book"""
+def register_trailing_stop(instrumentId: str, exchange: str, transaction_type: str, quantity: int,
+                           trail: float, reference_price: Optional[float] = None, product: str = "INTRADAY",
+                           order_type: str = "MARKET", price: float = 0) -> dict:
+    """Trailing stop: a SELL exit trails the high by trail, a BUY exit trails the low. Defaults to the current LTP"""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return{
-            "status": "success",
-            "data": alice.get_gtt_order_book()
-        }
+        action = _rule_action(instrumentId, exchange, transaction_type, quantity, product, order_type, price)
+        if reference_price is None:
+            quote = alice_manager.get_quote_store().get(instrument_key(instrumentId, exchange))
+            if quote is None or quote.ltp is None:
+                alice_manager.get_feed().subscribe([instrument_key(instrumentId, exchange)])
+                return {"status": "error", "message": "No LTP yet for this instrument; pass reference_price or retry"}
+            reference_price = quote.ltp
+        return _register_rule(lambda engine, key: engine.add_trailing_stop(key, trail, reference_price, action),
+                              instrumentId, exchange)
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 @mcp.tool()
-def get_modify_gtt_order(brokerOrderId: str, instrumentId: str, tradingSymbol: str, 
-                            exchange: str, orderType: str, product: str, validity: str, 
-                            quantity: int, price: float, orderComplexity: str, 
-                            gttType: str, gttValue: float)->dict:
-    """Modify GTT Order"""
+def register_bracket_exit(instrumentId: str, exchange: str, transaction_type: str, quantity: int,
+                          target: float, stop: float, trail: Optional[float] = None, product: str = "INTRADAY",
+                          order_type: str = "MARKET", price: float = 0) -> dict:
+    """Exit an open position at target or stop (optionally trailing), whichever the LTP reaches first"""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return{
-            "status": "success",
-            "data": alice.get_modify_gtt_order(
-                brokerOrderId=brokerOrderId,
-                instrumentId = instrumentId,
-                tradingSymbol=tradingSymbol,
-                exchange=exchange,
-                orderType=orderType,
-                product=product,
-                validity=validity,
-                quantity=quantity,
-                price=price,
-                orderComplexity=orderComplexity,
-                gttType=gttType,
-                gttValue=gttValue,
-            )
-        }
+        action = _rule_action(instrumentId, exchange, transaction_type, quantity, product, order_type, price)
+        return _register_rule(lambda engine, key: engine.add_bracket_exit(key, target, stop, action, trail=trail),
+                              instrumentId, exchange)
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 @mcp.tool()
-def get_cancel_gtt_order(brokerOrderId: str):
-    """Cancel GTT Order"""
+def list_conditional_orders(state: Optional[str] = None) -> dict:
+    """List local conditional orders (state: active, firing, fired, cancelled, error) and engine stats"""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return{
-            "status": "success",
-            "data": alice.get_cancel_gtt_order(
-                brokerOrderId=brokerOrderId
-            )
-        }
+        engine = alice_manager.get_trigger_engine()
+        return {"status": "success", "data": {"rules": engine.list_rules(state), "stats": engine.stats()}}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 @mcp.tool()
-def get_limits():
-    """Get Limits"""
+def cancel_conditional_order(rule_id: str) -> dict:
+    """Cancel an active local conditional order"""
     try:
-        alice = get_alice_client()
-        ensure_authenticated()
-        return{
-            "status": "success",
-            "data": alice.get_limits()
-        }
+        engine = alice_manager.get_trigger_engine()
+        if not engine.cancel(rule_id):
+            return {"status": "error", "message": f"No active rule {rule_id}"}
+        return {"status": "success", "data": engine.get(rule_id)}
     except Exception as e:
-        return {"status": "error", "message": str(e)}
\ No newline at end of file
+        return {"status": "error", "message": str(e)}
@@ -0,0 +1,165 @@
+"""Measure bytes transferred and parse time of conditional book fetches.
+
+Usage:
+    python benchmarks/bench_conditional.py [--rows 5000] [--calls 100] [--change-every 10]
+
+A local fake broker serves an order book that changes every
+``--change-every`` requests. It runs once per validator mode:
+``etag`` (If-None-Match), ``last_modified`` (If-Modified-Since) and ``none``
+(no validators, so the client falls back to hashing the body), each with
+and without gzip. A run with conditional fetching disabled is the
+baseline. Every call checks that the client returned the broker's current
+book version. The report gives wire and decoded bytes, parse time, 304 and
+unchanged counts, and mean latency per run.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_models import order_book
+
+BOOK_PATH = "/open-api/od/v1/orders/book"
+EPOCH = 1_700_000_000
+
+
+class FakeBroker(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, rows: int):
+        super().__init__(("127.0.0.1", 0), BookHandler)
+        self.rows = rows
+        self.base = json.loads(order_book(rows))
+        self.lock = threading.Lock()
+        self.configure("none", False, 10)
+
+    def configure(self, validators: str, compress: bool, change_every: int) -> None:
+        with self.lock:
+            self.validators = validators
+            self.compress = compress
+            self.change_every = change_every
+            self.requests = 0
+            self.version = -1
+            self._publish(0)
+
+    def _publish(self, version: int) -> None:
+        self.version = version
+        self.base["version"] = version
+        self.body = json.dumps(self.base).encode()
+        self.gzipped = gzip.compress(self.body, compresslevel=6)
+        # Whole minutes apart, so HTTP-date's one-second resolution never merges two versions
+        self.modified = EPOCH + version * 60
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class BookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            if server.requests and server.requests % server.change_every == 0:
+                server._publish(server.version + 1)
+            server.requests += 1
+            version, body, gzipped, modified = server.version, server.body, server.gzipped, server.modified
+            validators, compress = server.validators, server.compress
+        headers = {"Content-Type": "application/json"}
+        not_modified = False
+        if validators == "etag":
+            headers["ETag"] = f'"v{version}"'
+            not_modified = self.headers.get("If-None-Match") == headers["ETag"]
+        elif validators == "last_modified":
+            headers["Last-Modified"] = formatdate(modified, usegmt=True)
+            since = self.headers.get("If-Modified-Since")
+            not_modified = since is not None and parsedate_to_datetime(since).timestamp() >= modified
+        if not_modified:
+            self.send_response(304)
+            for name, value in headers.items():
+                if name != "Content-Type":
+                    self.send_header(name, value)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzipped
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(alice, broker: FakeBroker, validators: str, compress: bool, args, conditional: bool = True) -> dict:
+    from Client.conditional import ConditionalFetcher
+
+    broker.configure(validators, compress, args.change_every)
+    alice.fetcher = ConditionalFetcher(window=1) if conditional else None
+    alice._model_memo.clear()
+    stale = 0
+    latencies = []
+    for _ in range(args.calls):
+        alice.read_cache.invalidate("order_book")
+        started = time.perf_counter()
+        book = alice.get_order_book()
+        latencies.append(time.perf_counter() - started)
+        with broker.lock:
+            current = broker.version
+        if book.get("version") != current or len(book["result"]) != broker.rows:
+            stale += 1
+    run_info = {
+        "validators": validators if conditional else "disabled",
+        "gzip": compress,
+        "calls": args.calls,
+        "stale": stale,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+    }
+    if conditional:
+        stats = alice.fetcher.stats()["get_order_book"]
+        run_info.update(results=stats["results"], wire_bytes=stats["wire_bytes"], body_bytes=stats["body_bytes"],
+                        parse_ms=stats["parse_ms"])
+    return run_info
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--change-every", type=int, default=10)
+    args = parser.parse_args()
+
+    broker = FakeBroker(args.rows)
+    threading.Thread(target=broker.serve_forever, daemon=True).start()
+    # Settings are read at import time: point the client at the fake broker with no rate limit
+    os.environ.update(BASE_URL=broker.url, RATE_LIMIT_PER_SEC="100000", RATE_LIMIT_BURST="100000")
+    from Client.client import AliceBlue
+    from Client.config import APP_KEY, API_SECRET
+
+    alice = AliceBlue(APP_KEY, API_SECRET)
+    alice.headers = {"Authorization": "Bearer bench"}
+
+    runs = [run(alice, broker, "none", False, args, conditional=False)]
+    for validators in ("etag", "last_modified", "none"):
+        for compress in (False, True):
+            runs.append(run(alice, broker, validators, compress, args))
+    print(json.dumps({"rows": args.rows, "change_every": args.change_every, "runs": runs}, indent=2))
+    broker.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compare memory and access cost of raw dict rows against the typed models.
+
+Usage:
+    python benchmarks/bench_models.py [--rows 50000]
+
+Builds a synthetic order book shaped like the broker's, parses it from JSON
+and measures the retained size (tracemalloc) of raw dicts, slotted model
+objects and the columnar ModelTable, plus the time to sum a numeric field.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Client.models import ModelTable, Order, parse_rows
+
+
+def order_book(rows: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    result = []
+    for i in range(rows):
+        qty = rng.choice([1, 5, 10, 25, 50, 75, 100])
+        result.append({
+            "brokerOrderId": f"25{i:010d}",
+            "exchangeOrderId": f"1100000{i:08d}",
+            "tradingSymbol": f"SYM{i % 500}-EQ",
+            "instrumentId": str(1000 + i % 500),
+            "exchange": rng.choice(["NSE", "BSE", "NFO"]),
+            "transactionType": rng.choice(["BUY", "SELL"]),
+            "orderType": rng.choice(["LIMIT", "MARKET", "SL"]),
+            "product": rng.choice(["INTRADAY", "DELIVERY", "NORMAL"]),
+            "orderComplexity": "REGULAR",
+            "validity": "DAY",
+            "orderStatus": rng.choice(["OPEN", "COMPLETE", "CANCELLED", "REJECTED"]),
+            "quantity": qty,
+            "filledQuantity": rng.randint(0, qty),
+            "pendingQuantity": 0,
+            "price": str(round(rng.uniform(10, 5000), 2)),
+            "triggerPrice": "0.00",
+            "averageTradedPrice": str(round(rng.uniform(10, 5000), 2)),
+            "orderTime": "18-Oct-2026 10:15:00",
+            "rejectionReason": "",
+        })
+    return json.dumps({"status": "Ok", "result": result})
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    text = order_book(args.rows)
+    raw, raw_size, raw_time = measure(lambda: json.loads(text))
+    rows = raw["result"]
+    objects, obj_size, obj_time = measure(lambda: parse_rows(raw, Order, "objects"))
+    table, table_size, table_time = measure(lambda: ModelTable(Order, rows))
+
+    def timed(fn, repeat=5):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - started) / repeat * 1000
+
+    report = {
+        "rows": args.rows,
+        "raw_dicts": {"mb": round(raw_size / 2**20, 2), "build_ms": round(raw_time * 1000, 1),
+                      "sum_price_ms": round(timed(lambda: sum(float(r["price"]) for r in rows)), 2)},
+        "objects": {"mb": round(obj_size / 2**20, 2), "build_ms": round(obj_time * 1000, 1),
+                    "sum_price_ms": round(timed(lambda: sum(o.price for o in objects)), 2)},
+        "columnar": {"mb": round(table_size / 2**20, 2), "build_ms": round(table_time * 1000, 1),
+                     "sum_price_ms": round(timed(lambda: sum(table.column("price"))), 2)},
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
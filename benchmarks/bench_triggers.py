@@ -0,0 +1,106 @@
+"""Replay ticks through the conditional-order engine and report tick-to-order latency.
+
+Usage:
+    python benchmarks/bench_triggers.py [--rules 10000] [--instruments 50] [--ticks 200000]
+                                        [--feed capture.jsonl]
+
+``--feed`` replays raw feed frames (one JSON frame per line); otherwise a
+seeded random walk is generated per instrument.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Client.feed import decode
+from Client.triggers import ConditionalOrderEngine
+
+
+class NullClient:
+    """Accepts orders instantly so only engine latency is measured."""
+
+    def __init__(self):
+        self.orders = 0
+
+    def get_place_order(self, **kwargs):
+        self.orders += 1
+        return {"stat": "Ok"}
+
+
+def synthetic_ticks(instruments: int, ticks: int, seed: int):
+    rng = random.Random(seed)
+    prices = {f"NSE|{i}": 1000.0 for i in range(instruments)}
+    keys = list(prices)
+    for _ in range(ticks):
+        key = rng.choice(keys)
+        prices[key] = max(1.0, prices[key] * (1 + rng.gauss(0, 0.001)))
+        yield key, prices[key]
+
+
+def feed_ticks(path: str):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            decoded = decode(line) if line.strip() else None
+            if decoded and "ltp" in decoded[2]:
+                yield decoded[1], decoded[2]["ltp"]
+
+
+def register_rules(engine: ConditionalOrderEngine, rules: int, instruments: int, seed: int):
+    rng = random.Random(seed)
+    for i in range(rules):
+        key = f"NSE|{rng.randrange(instruments)}"
+        action = {"instrument_id": key.split("|")[1], "exchange": "NSE", "transaction_type": "SELL", "quantity": 1}
+        kind = i % 3
+        if kind == 0:
+            engine.add_oco(key, 1000 * (1 + rng.uniform(0.005, 0.05)), 1000 * (1 - rng.uniform(0.005, 0.05)), action)
+        elif kind == 1:
+            engine.add_trailing_stop(key, 1000 * rng.uniform(0.005, 0.05), 1000.0, action)
+        else:
+            engine.add_bracket_exit(key, 1000 * (1 + rng.uniform(0.01, 0.05)), 1000 * (1 - rng.uniform(0.01, 0.05)),
+                                    action, trail=1000 * rng.uniform(0.005, 0.03))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=10000)
+    parser.add_argument("--instruments", type=int, default=50)
+    parser.add_argument("--ticks", type=int, default=200000)
+    parser.add_argument("--feed", help="JSONL capture of raw feed frames")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    client = NullClient()
+    engine = ConditionalOrderEngine(client, latency_window=100000)
+    started = time.perf_counter()
+    register_rules(engine, args.rules, args.instruments, args.seed)
+    registered = time.perf_counter() - started
+
+    ticks = feed_ticks(args.feed) if args.feed else synthetic_ticks(args.instruments, args.ticks, args.seed)
+    started = time.perf_counter()
+    count = 0
+    for key, price in ticks:
+        engine.on_tick(key, price)
+        count += 1
+    elapsed = time.perf_counter() - started
+    engine.shutdown(wait=True)
+
+    stats = engine.stats()
+    print(json.dumps({
+        "rules": args.rules,
+        "register_s": round(registered, 3),
+        "ticks": count,
+        "ticks_per_s": round(count / elapsed) if elapsed else None,
+        "us_per_tick": round(elapsed / count * 1e6, 2) if count else None,
+        "fired": stats["fired"],
+        "orders_sent": client.orders,
+        "tick_to_order_p50_us": stats["tick_to_order_p50_us"],
+        "tick_to_order_p99_us": stats["tick_to_order_p99_us"],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Measure tool-call throughput of the multi-worker server against worker count.
+
+Usage:
+    python benchmarks/bench_workers.py [--workers 1,2,4] [--duration 10] [--clients 4] [--concurrency 8]
+                                       [--rows 2000] [--uncached-ratio 0.2] [--rate-limit 20]
+
+A local fake broker serves large positions/holdings books and small order
+histories, and counts requests per second. For each worker count the
+server is started through Server/multiworker.py. It is pointed at the fake
+broker and at a StoreServer pre-seeded with a session. Client processes
+then call get_portfolio_analytics (CPU-bound, served from the shared read
+cache) mixed with get_order_history (uncached, one broker request each).
+The report gives calls/s and latency per worker count, plus the peak
+broker QPS next to the configured limit.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Client.config import APP_KEY
+from Client.storage import StoreServer
+
+
+def book(rows: int, kind: str, seed: int = 7) -> bytes:
+    rng = random.Random(seed)
+    result = []
+    for i in range(rows):
+        row = {"tradingSymbol": f"SYM{i}-EQ", "instrumentId": str(1000 + i), "exchange": rng.choice(["NSE", "BSE"]),
+               "product": rng.choice(["INTRADAY", "DELIVERY"]), "ltp": str(round(rng.uniform(10, 5000), 2))}
+        if kind == "positions":
+            qty = rng.randint(-500, 500)
+            row.update(netQuantity=str(qty), netAvgPrice=str(round(rng.uniform(10, 5000), 2)),
+                       realizedPnl=str(round(rng.uniform(-1e4, 1e4), 2)), unrealizedPnl=str(round(rng.uniform(-1e4, 1e4), 2)))
+        else:
+            row.update(holdingQuantity=str(rng.randint(1, 500)), averagePrice=str(round(rng.uniform(10, 5000), 2)),
+                       closePrice=str(round(rng.uniform(10, 5000), 2)))
+        result.append(row)
+    return json.dumps({"status": "Ok", "result": result}).encode()
+
+
+class FakeBroker(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, rows: int):
+        super().__init__(("127.0.0.1", 0), BrokerHandler)
+        self.bodies = {"positions": book(rows, "positions"), "CNC": book(rows // 2, "holdings")}
+        self.hits = Counter()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class BrokerHandler(BaseHTTPRequestHandler):
+    def _reply(self, body: bytes):
+        with self.server.lock:
+            self.server.hits[int(time.time())] += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply(self.server.bodies.get(self.path.rsplit("/", 1)[-1], b'{"stat":"Ok"}'))
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(b'{"stat":"Ok","result":[{"orderStatus":"COMPLETE"}]}')
+
+    def log_message(self, *args):
+        pass
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def call_tool(session: requests.Session, url: str, name: str, arguments: dict, request_id: int) -> dict:
+    res = session.post(url, json={"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+                                  "params": {"name": name, "arguments": arguments}},
+                       headers={"Accept": "application/json, text/event-stream"}, timeout=60)
+    res.raise_for_status()
+    text = res.text
+    if res.headers.get("Content-Type", "").startswith("text/event-stream"):
+        text = next(line[5:] for line in text.splitlines() if line.startswith("data:"))
+    return json.loads(text)
+
+
+def client_process(url: str, duration: float, concurrency: int, uncached_ratio: float, seed: int, out):
+    rng = random.Random(seed)
+    latencies, errors = [], 0
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def worker(n):
+        nonlocal errors
+        session = requests.Session()
+        i = 0
+        while time.monotonic() < stop_at:
+            i += 1
+            if rng.random() < uncached_ratio:
+                name, args = "get_order_history", {"brokerOrderId": str(i)}
+            else:
+                name, args = "get_portfolio_analytics", {"top_n": 5}
+            started = time.perf_counter()
+            try:
+                reply = call_tool(session, url, name, args, n * 1000000 + i)
+                ok = '"success"' in json.dumps(reply.get("result", {}))
+            except Exception:
+                ok = False
+            with lock:
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    out.put((latencies, errors))
+
+
+def wait_ready(url: str, timeout: float = 60):
+    give_up = time.monotonic() + timeout
+    session = requests.Session()
+    while time.monotonic() < give_up:
+        try:
+            if "result" in call_tool(session, url, "server_status", {}, 0):
+                return
+        except Exception:
+            time.sleep(0.3)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+def run(workers: int, args, broker: FakeBroker, store: StoreServer) -> dict:
+    port = free_port()
+    env = dict(os.environ, BASE_URL=broker.url, STORE_URL=store.url, RATE_LIMIT_PER_SEC=str(args.rate_limit),
+               RATE_LIMIT_BURST=str(args.rate_limit), PYTHONUNBUFFERED="1")
+    env.pop("REPLAY_PATH", None)
+    env.pop("RECORD_PATH", None)
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "Server", "multiworker.py"), "--workers", str(workers),
+                             "--host", "127.0.0.1", "--port", str(port)], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}/mcp"
+    try:
+        wait_ready(url)
+        # Warm every worker's client before measuring
+        warm = requests.Session()
+        for i in range(workers * 4):
+            call_tool(warm, url, "get_portfolio_analytics", {"top_n": 5}, i)
+        broker.hits.clear()
+        out = multiprocessing.Queue()
+        clients = [multiprocessing.Process(target=client_process,
+                                           args=(url, args.duration, args.concurrency, args.uncached_ratio, s, out))
+                   for s in range(args.clients)]
+        started = time.monotonic()
+        for c in clients:
+            c.start()
+        results = [out.get() for _ in clients]
+        elapsed = time.monotonic() - started
+        for c in clients:
+            c.join()
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    latencies = sorted(l for r in results for l in r[0])
+    pick = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1) if latencies else None
+    with broker.lock:
+        per_second = list(broker.hits.values())
+    return {
+        "workers": workers,
+        "calls": len(latencies),
+        "errors": sum(r[1] for r in results),
+        "calls_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "broker_peak_qps": max(per_second, default=0),
+        "broker_limit_qps": args.rate_limit,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--uncached-ratio", type=float, default=0.2)
+    parser.add_argument("--rate-limit", type=float, default=20)
+    args = parser.parse_args()
+
+    broker = FakeBroker(args.rows)
+    threading.Thread(target=broker.serve_forever, daemon=True).start()
+    store = StoreServer().start()
+    store.store.set(f"session:{APP_KEY}", {"user_session": "bench", "user_id": "BENCH"})
+
+    curve = [run(int(w), args, broker, store) for w in args.workers.split(",")]
+    print(json.dumps({"cpus": os.cpu_count(), "rows": args.rows, "curve": curve}, indent=2))
+    broker.shutdown()
+    store.stop()
+
+
+if __name__ == "__main__":
+    main()